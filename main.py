@@ -1,126 +1,2613 @@
-from datetime import datetime
-from queue import Queue, LifoQueue
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import nullcontext, redirect_stdout
+from datetime import datetime, timedelta
+from heapq import heapify, heappop, heappush, nlargest
+from itertools import count
+from operator import attrgetter
+from queue import Empty, Queue, LifoQueue
+import json
+import math
+import mmap
 import os
+import re
+import sqlite3
+import struct
+import sys
+import time
+import unicodedata
+
+try:
+    import readline
+except ImportError:
+    # Sin readline (por ejemplo en Windows) la consola funciona sin autocompletado
+    readline = None
+
+# Origen y unidad para guardar fechas de vencimiento como enteros (microsegundos, sin perder precisión)
+EPOCA = datetime(1970, 1, 1)
+MICROSEGUNDO = timedelta(microseconds=1)
+# Claves para buscar tareas y categorías por ID en listas ordenadas
+ID_TAREA = attrgetter('id')
+ID_CATEGORIA = attrgetter('id')
+# Archivos donde la consola interactiva guarda el registro de operaciones y la instantánea
+RUTA_REGISTRO = 'tareas.wal'
+RUTA_INSTANTANEA = 'tareas.json'
+# Separador entre los nombres de la ruta de una categoría ('Trabajo/Proyecto/Backend')
+SEPARADOR_RUTA = '/'
 
 class Tareas:
     """
     Clase que representa una tarea.
 
-    Atributos:
-        id (int): Identificador único de la tarea.
-        titulo (str): Título de la tarea.
-        descripcion (str): Descripción de la tarea.
-        prioridad (int): Prioridad de la tarea (1 alta, 3 baja).
-        fecha_vencimiento (datetime): Fecha de vencimiento de la tarea.
-    """
-    def __init__(self, id: int, titulo: str, descripcion: str, prioridad: int, fecha_vencimiento: datetime):
-        self.id = id
-        self.titulo = titulo
-        self.descripcion = descripcion
-        self.prioridad = prioridad
-        self.fecha_vencimiento = fecha_vencimiento
+    Atributos:
+        id (int): Identificador único de la tarea.
+        titulo (str): Título de la tarea.
+        descripcion (str): Descripción de la tarea.
+        prioridad (int): Prioridad de la tarea (1 alta, 3 baja).
+        fecha_vencimiento (datetime): Fecha de vencimiento de la tarea.
+    """
+    # Sin __dict__ por instancia para reducir la memoria de cada tarea
+    __slots__ = ('id', 'titulo', 'descripcion', 'prioridad', 'fecha_vencimiento')
+
+    def __init__(self, id: int, titulo: str, descripcion: str, prioridad: int, fecha_vencimiento: datetime):
+        self.id = id
+        self.titulo = titulo
+        self.descripcion = descripcion
+        self.prioridad = prioridad
+        self.fecha_vencimiento = fecha_vencimiento
+
+    def __str__(self):
+        """Representación en string de la tarea."""
+        return f'{self.titulo} - {self.descripcion} - Prioridad: {self.prioridad} - Vencimiento: {self.fecha_vencimiento.strftime("%d/%m/%Y")}'
+
+    def claveOrden(self) -> tuple:
+        """Clave de ordenación por prioridad, fecha de vencimiento e ID."""
+        return (self.prioridad, self.fecha_vencimiento, self.id)
+
+
+class ColaSimple:
+    """
+    Cola FIFO sin bloqueos para uso en un solo hilo.
+
+    Ofrece la parte de la interfaz de queue.Queue que usa el manejador (put, get,
+    empty, qsize, queue y mutex), evitando el cerrojo y las condiciones en cada operación.
+    """
+    # Contexto vacío para que el código que usa "with cola.mutex" funcione igual
+    mutex = nullcontext()
+
+    def __init__(self, maxsize: int = 0):
+        self.maxsize = maxsize
+        self._init(maxsize)
+
+    def qsize(self) -> int:
+        """Devuelve el número de elementos en la cola."""
+        return self._qsize()
+
+    def empty(self) -> bool:
+        """Indica si la cola está vacía."""
+        return not self._qsize()
+
+    def put(self, item):
+        """Agrega un elemento a la cola."""
+        self._put(item)
+
+    def get(self):
+        """Saca el siguiente elemento de la cola, o lanza queue.Empty si no hay."""
+        if not self._qsize():
+            raise Empty
+        return self._get()
+
+    def _init(self, maxsize):
+        self.queue = deque()
+
+    def _qsize(self):
+        return len(self.queue)
+
+    def _put(self, item):
+        self.queue.append(item)
+
+    def _get(self):
+        return self.queue.popleft()
+
+
+class PilaSimple(ColaSimple):
+    """
+    Pila LIFO sin bloqueos para uso en un solo hilo (equivalente a queue.LifoQueue).
+    """
+    def _get(self):
+        return self.queue.pop()
+
+
+class OrdenFIFO:
+    """
+    Orden de llegada (FIFO) para colas de tareas urgentes.
+    """
+    def tareasEnOrden(self) -> list[Tareas]:
+        """Devuelve las tareas pendientes en el orden en que se procesarán."""
+        with self.mutex:
+            return list(self.queue)
+
+    def retirar(self, tarea: Tareas) -> bool:
+        """Quita una tarea pendiente concreta (normalmente la última agregada o la siguiente); False si ya no está en la cola."""
+        with self.mutex:
+            if self.queue and self.queue[-1] is tarea:
+                self.queue.pop()
+            elif self.queue and self.queue[0] is tarea:
+                self.queue.popleft()
+            elif tarea in self.queue:
+                self.queue.remove(tarea)
+            else:
+                return False
+            return True
+
+    def devolver(self, tarea: Tareas):
+        """Vuelve a poner una tarea ya procesada al frente de la cola."""
+        with self.mutex:
+            self.queue.appendleft(tarea)
+            if hasattr(self, 'not_empty'):
+                self.not_empty.notify()
+
+
+class OrdenPrioridad:
+    """
+    Orden por prioridad y fecha de vencimiento para colas de tareas urgentes.
+
+    Se implementa con un montículo; las tareas empatadas se procesan en orden de llegada.
+    """
+    def _init(self, maxsize):
+        self.queue = []
+        self.contador = count()
+        # Las tareas devueltas usan números negativos para ir delante de las que empatan con ellas
+        self.devueltas = count(-1, -1)
+
+    def _qsize(self):
+        return len(self.queue)
+
+    def _put(self, tarea):
+        heappush(self.queue, (tarea.prioridad, tarea.fecha_vencimiento, next(self.contador), tarea))
+
+    def _get(self):
+        return heappop(self.queue)[-1]
+
+    def tareasEnOrden(self) -> list[Tareas]:
+        """Devuelve las tareas pendientes en el orden en que se procesarán."""
+        with self.mutex:
+            return [entrada[-1] for entrada in sorted(self.queue)]
+
+    def retirar(self, tarea: Tareas) -> bool:
+        """Quita una tarea pendiente concreta; False si ya no está en la cola."""
+        with self.mutex:
+            posicion = next((i for i, entrada in enumerate(self.queue) if entrada[-1] is tarea), None)
+            if posicion is None:
+                return False
+            self.queue[posicion] = self.queue[-1]
+            self.queue.pop()
+            heapify(self.queue)
+            return True
+
+    def devolver(self, tarea: Tareas):
+        """Vuelve a poner una tarea ya procesada, por delante de las que empatan con ella."""
+        with self.mutex:
+            heappush(self.queue, (tarea.prioridad, tarea.fecha_vencimiento, next(self.devueltas), tarea))
+            if hasattr(self, 'not_empty'):
+                self.not_empty.notify()
+
+
+class ColaUrgenteFIFO(OrdenFIFO, Queue):
+    """Cola de tareas urgentes FIFO sincronizada entre hilos."""
+
+
+class ColaUrgentePrioridad(OrdenPrioridad, Queue):
+    """Cola de tareas urgentes por prioridad sincronizada entre hilos."""
+
+
+class ColaUrgenteFIFOSimple(OrdenFIFO, ColaSimple):
+    """Cola de tareas urgentes FIFO para uso en un solo hilo."""
+
+
+class ColaUrgentePrioridadSimple(OrdenPrioridad, ColaSimple):
+    """Cola de tareas urgentes por prioridad para uso en un solo hilo."""
+
+
+class Categoria:
+    """
+    Clase que representa una categoría que puede contener subcategorías y tareas.
+
+    Atributos:
+        id (int): Identificador único de la categoría.
+        nombre (str): Nombre de la categoría.
+        padre (Categoria): Categoría que contiene a esta, o None si es una categoría principal.
+        subcategorias (list[Categoria]): Lista de subcategorías de esta categoría.
+        tareasUrgentes (Queue[Tareas]): Cola de tareas urgentes de esta categoría (por prioridad si no se indica otra).
+        tareas (list[Tareas]): Lista de tareas asociadas a esta categoría, en orden de ID (de creación).
+        tareas_ordenadas (list[Tareas]): Tareas ordenadas por prioridad y fecha de vencimiento.
+        cargador (ManejadorTareas | InstantaneaBinaria): Objeto que carga bajo demanda las subcategorías
+            y tareas de una categoría guardada (el manejador desde su almacén o una instantánea
+            binaria), o None si la categoría está completa en memoria.
+    """
+    __slots__ = ('id', 'nombre', 'padre', 'subcategorias', 'tareasUrgentes', 'tareas', 'tareas_ordenadas', 'cargador')
+
+    # Atributos que se cargan juntos la primera vez que se usa alguno de ellos
+    CONTENIDO = frozenset({'tareasUrgentes', 'tareas', 'tareas_ordenadas'})
+
+    def __init__(self, id: int, nombre: str, tareasUrgentes: Queue = None, cargador=None):
+        self.id = id
+        self.nombre = nombre
+        self.padre: Categoria = None
+        self.cargador = cargador
+        # Una categoría con cargador deja sus listas sin asignar hasta que se usan
+        if cargador is not None:
+            return
+        self.subcategorias: list[Categoria] = []
+        self.tareasUrgentes: Queue[Tareas] = tareasUrgentes if tareasUrgentes is not None else ColaUrgentePrioridad()
+        self.tareas: list[Tareas] = []
+        self.tareas_ordenadas: list[Tareas] = []
+
+    def __getattr__(self, nombre: str):
+        # Solo se llama cuando un atributo aún no tiene valor: se carga desde el almacén
+        if nombre == 'subcategorias' and self.cargador is not None:
+            self.cargador.cargarSubcategorias(self)
+        elif nombre in Categoria.CONTENIDO and self.cargador is not None:
+            self.cargador.cargarContenido(self)
+        else:
+            raise AttributeError(nombre)
+        return object.__getattribute__(self, nombre)
+
+    def __str__(self):
+        """Representación en string de la categoría."""
+        return f'{self.nombre}'
+
+    def ancestros(self):
+        """
+        Recorre los ancestros de la categoría, desde su padre hasta la categoría principal.
+
+        Returns:
+            Iterator[Categoria]: Los ancestros, del más cercano al más lejano.
+        """
+        padre = self.padre
+        while padre is not None:
+            yield padre
+            padre = padre.padre
+
+    def ruta(self) -> str:
+        """
+        Devuelve la ruta completa de la categoría, por ejemplo 'Trabajo/Proyecto/Backend'.
+        """
+        nombres = [self.nombre]
+        nombres.extend(ancestro.nombre for ancestro in self.ancestros())
+        return SEPARADOR_RUTA.join(reversed(nombres))
+
+    def cargado(self, nombre: str) -> bool:
+        """
+        Indica si un atributo ya está en memoria, sin cargarlo.
+
+        Args:
+            nombre (str): Nombre del atributo ('subcategorias' o 'tareas').
+        """
+        try:
+            object.__getattribute__(self, nombre)
+        except AttributeError:
+            return False
+        return True
+
+    def descargarContenido(self):
+        """Libera las tareas y la cola urgente cargadas; se volverán a cargar si se usan."""
+        for nombre in Categoria.CONTENIDO:
+            delattr(self, nombre)
+
+    def agregarTarea(self, tarea: Tareas):
+        """
+        Agrega una tarea manteniendo el orden por ID y por prioridad y fecha de vencimiento.
+
+        Una tarea restaurada al deshacer vuelve así a su posición original en la lista.
+
+        Args:
+            tarea (Tareas): Tarea a agregar.
+        """
+        if not self.tareas or self.tareas[-1].id < tarea.id:
+            self.tareas.append(tarea)
+        else:
+            insort(self.tareas, tarea, key=ID_TAREA)
+        insort(self.tareas_ordenadas, tarea, key=Tareas.claveOrden)
+
+    def cargarTareas(self, tareas: list):
+        """
+        Agrega de una vez tareas ya ordenadas por ID, ordenando el índice una sola vez.
+
+        Args:
+            tareas (list[Tareas]): Tareas a agregar, con IDs mayores que los existentes.
+        """
+        self.tareas.extend(tareas)
+        self.tareas_ordenadas.extend(tareas)
+        self.tareas_ordenadas.sort(key=Tareas.claveOrden)
+
+    def quitarTarea(self, tarea: Tareas):
+        """
+        Quita una tarea de la categoría y de su orden.
+
+        Args:
+            tarea (Tareas): Tarea a quitar.
+        """
+        del self.tareas[bisect_left(self.tareas, tarea.id, key=ID_TAREA)]
+        del self.tareas_ordenadas[bisect_left(self.tareas_ordenadas, tarea.claveOrden(), key=Tareas.claveOrden)]
+
+    def actualizarTarea(self, tarea: Tareas, **campos):
+        """
+        Cambia atributos de una tarea y, si cambia su clave, la recoloca en el orden de la categoría.
+
+        Args:
+            tarea (Tareas): Tarea a modificar.
+            **campos: Atributos de la tarea y sus nuevos valores.
+        """
+        reordenar = 'prioridad' in campos or 'fecha_vencimiento' in campos
+        # Sacar la tarea del orden con su clave actual antes de cambiarla
+        if reordenar:
+            del self.tareas_ordenadas[bisect_left(self.tareas_ordenadas, tarea.claveOrden(), key=Tareas.claveOrden)]
+        for campo, valor in campos.items():
+            setattr(tarea, campo, valor)
+        if reordenar:
+            insort(self.tareas_ordenadas, tarea, key=Tareas.claveOrden)
+
+    def agregarSubcategoria(self, id: int, nombre: str, tareasUrgentes: Queue = None):
+        """
+        Agrega una nueva subcategoría a la categoría actual.
+        
+        Args:
+            id (int): Identificador de la nueva subcategoría.
+            nombre (str): Nombre de la nueva subcategoría.
+            tareasUrgentes (Queue, optional): Cola urgente de la subcategoría (por defecto, una
+                del mismo tipo que la de esta categoría).
+
+        Returns:
+            Categoria: La subcategoría creada.
+        """
+        if tareasUrgentes is None:
+            tareasUrgentes = type(self.tareasUrgentes)()
+        categoria = Categoria(id, nombre, tareasUrgentes)
+        categoria.padre = self
+        self.subcategorias.append(categoria)
+        return categoria
+
+
+class TablaTareas:
+    """
+    Columnas de tareas en arreglos tipados, con títulos y descripciones en una
+    tabla de cadenas sin repetidos; InstantaneaBinaria las reúne aquí antes de escribirlas.
+
+    Atributos:
+        ids (array): IDs de las tareas.
+        prioridades (array): Prioridades de las tareas.
+        vencimientos (array): Fechas de vencimiento en microsegundos desde EPOCA.
+        titulos (array): Posición del título en la tabla de cadenas.
+        descripciones (array): Posición de la descripción en la tabla de cadenas.
+        cadenas (list[str]): Tabla de cadenas sin repetidos.
+    """
+    __slots__ = ('ids', 'prioridades', 'vencimientos', 'titulos', 'descripciones', 'cadenas', 'indice_cadenas')
+
+    def __init__(self):
+        self.ids = array('q')
+        self.prioridades = array('b')
+        self.vencimientos = array('q')
+        self.titulos = array('l')
+        self.descripciones = array('l')
+        self.cadenas: list[str] = []
+        self.indice_cadenas: dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def internar(self, cadena: str) -> int:
+        """
+        Devuelve la posición de una cadena en la tabla, agregándola si no existe.
+
+        Args:
+            cadena (str): Cadena a internar.
+
+        Returns:
+            int: Posición de la cadena en la tabla de cadenas.
+        """
+        posicion = self.indice_cadenas.get(cadena)
+        if posicion is None:
+            posicion = len(self.cadenas)
+            self.cadenas.append(cadena)
+            self.indice_cadenas[cadena] = posicion
+        return posicion
+
+    def agregar(self, tarea: Tareas):
+        """
+        Agrega una tarea como nueva fila de la tabla.
+
+        Args:
+            tarea (Tareas): Tarea a agregar.
+        """
+        self.ids.append(tarea.id)
+        self.prioridades.append(tarea.prioridad)
+        self.vencimientos.append((tarea.fecha_vencimiento - EPOCA) // MICROSEGUNDO)
+        self.titulos.append(self.internar(tarea.titulo))
+        self.descripciones.append(self.internar(tarea.descripcion))
+
+
+class IndicePrefijos:
+    """
+    Índice ordenado de textos para autocompletar por prefijo sin distinguir mayúsculas.
+
+    Cada entrada es (clave, texto, id). Las entradas ordenadas se reparten en
+    bloques de como mucho 2 * TAMANO_BLOQUE, y de cada bloque se guarda su última
+    entrada: localizar una entrada son dos búsquedas binarias y agregar o quitar
+    solo mueve los elementos de un bloque, así que no crece con el tamaño del índice.
+    Las coincidencias de un prefijo quedan contiguas, aunque crucen bloques.
+
+    Atributos:
+        bloques (list[list[tuple]]): Bloques de entradas ordenadas por clave, texto e ID.
+        maximos (list[tuple]): Última entrada de cada bloque.
+        total (int): Número de entradas.
+    """
+    __slots__ = ('bloques', 'maximos', 'total')
+
+    TAMANO_BLOQUE = 512
+
+    def __init__(self):
+        self.bloques: list[list[tuple]] = []
+        self.maximos: list[tuple] = []
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        """Recorre las entradas en orden."""
+        for bloque in self.bloques:
+            yield from bloque
+
+    @staticmethod
+    def clave(texto: str) -> str:
+        """Normaliza un texto para compararlo sin distinguir mayúsculas."""
+        return texto.casefold()
+
+    def localizar(self, entrada: tuple, derecha: bool = False) -> tuple[int, int]:
+        """
+        Busca dónde iría una entrada.
+
+        Args:
+            entrada (tuple): Entrada (o prefijo de entrada) buscada.
+            derecha (bool, optional): Ponerse detrás de las entradas iguales en lugar de delante.
+
+        Returns:
+            tuple[int, int]: Bloque y posición dentro del bloque (el bloque es len(bloques) si va al final).
+        """
+        bisectar = bisect_right if derecha else bisect_left
+        numero = bisectar(self.maximos, entrada)
+        if numero == len(self.bloques):
+            return numero, 0
+        return numero, bisectar(self.bloques[numero], entrada)
+
+    def agregar(self, texto: str, id: int):
+        """
+        Agrega un texto al índice.
+
+        Args:
+            texto (str): Texto a indexar.
+            id (int): ID del objeto al que pertenece.
+        """
+        entrada = (self.clave(texto), texto, id)
+        self.total += 1
+        if not self.bloques:
+            self.bloques.append([entrada])
+            self.maximos.append(entrada)
+            return
+        # Una entrada mayor que todas va al último bloque
+        numero = min(bisect_left(self.maximos, entrada), len(self.bloques) - 1)
+        bloque = self.bloques[numero]
+        insort(bloque, entrada)
+        self.maximos[numero] = bloque[-1]
+        # Partir el bloque en dos si ha crecido demasiado
+        if len(bloque) > 2 * self.TAMANO_BLOQUE:
+            mitad = bloque[self.TAMANO_BLOQUE:]
+            del bloque[self.TAMANO_BLOQUE:]
+            self.bloques.insert(numero + 1, mitad)
+            self.maximos[numero] = bloque[-1]
+            self.maximos.insert(numero + 1, mitad[-1])
+
+    def agregarVarios(self, pares):
+        """
+        Agrega de una vez muchos textos, ordenando el índice una sola vez.
+
+        Args:
+            pares (Iterable[tuple[str, int]]): Pares (texto, id).
+        """
+        entradas = list(self)
+        entradas.extend((self.clave(texto), texto, id) for texto, id in pares)
+        entradas.sort()
+        tamano = self.TAMANO_BLOQUE
+        self.bloques = [entradas[inicio:inicio + tamano] for inicio in range(0, len(entradas), tamano)]
+        self.maximos = [bloque[-1] for bloque in self.bloques]
+        self.total = len(entradas)
+
+    def quitar(self, texto: str, id: int):
+        """
+        Quita un texto del índice (no hace nada si no está).
+
+        Args:
+            texto (str): Texto indexado.
+            id (int): ID del objeto al que pertenece.
+        """
+        entrada = (self.clave(texto), texto, id)
+        numero, posicion = self.localizar(entrada)
+        if numero == len(self.bloques) or self.bloques[numero][posicion] != entrada:
+            return
+        bloque = self.bloques[numero]
+        del bloque[posicion]
+        self.total -= 1
+        if bloque:
+            self.maximos[numero] = bloque[-1]
+        else:
+            del self.bloques[numero]
+            del self.maximos[numero]
+
+    def completar(self, prefijo: str, limite: int = 10) -> list[str]:
+        """
+        Devuelve los primeros textos distintos, en orden alfabético, que empiezan por un prefijo.
+
+        Args:
+            prefijo (str): Comienzo del texto.
+            limite (int, optional): Número máximo de textos a devolver.
+
+        Returns:
+            list[str]: Los textos encontrados.
+        """
+        clave = self.clave(prefijo)
+        bloques = self.bloques
+        textos = []
+        numero, posicion = self.localizar((clave,))
+        while len(textos) < limite and numero < len(bloques):
+            entrada = bloques[numero][posicion]
+            if not entrada[0].startswith(clave):
+                break
+            textos.append(entrada[1])
+            # Saltar de una vez las demás entradas con el mismo texto
+            numero, posicion = self.localizar((entrada[0], entrada[1], sys.maxsize), derecha=True)
+        return textos
+
+
+class IndiceTexto:
+    """
+    Índice invertido de palabras sobre el título y la descripción de las tareas.
+
+    Las palabras se comparan sin mayúsculas ni tildes ('Reunión' encuentra 'reunion').
+    De cada palabra se guardan las tareas que la contienen y en qué posiciones,
+    para poder buscar frases exactas sin volver a leer los textos.
+
+    Atributos:
+        posiciones (dict[str, dict[int, list[int]]]): Palabra -> ID de tarea -> posiciones de la palabra.
+        palabras (dict[int, tuple[str]]): ID de tarea -> palabras distintas que contiene.
+        longitudes_titulo (dict[int, int]): ID de tarea -> número de palabras de su título.
+    """
+    __slots__ = ('posiciones', 'palabras', 'longitudes_titulo')
+
+    PALABRA = re.compile(r'\w+')
+    # Frase entre comillas (con '-' delante para excluirla) o término suelto
+    CONSULTA = re.compile(r'(-?)"([^"]*)"?|(\S+)')
+
+    def __init__(self):
+        self.posiciones: dict[str, dict[int, list[int]]] = {}
+        self.palabras: dict[int, tuple] = {}
+        self.longitudes_titulo: dict[int, int] = {}
+
+    def __len__(self):
+        return len(self.palabras)
+
+    @staticmethod
+    def tokenizar(texto: str) -> list[str]:
+        """
+        Separa un texto en palabras en minúsculas y sin tildes.
+
+        Args:
+            texto (str): Texto a separar.
+
+        Returns:
+            list[str]: Las palabras en orden.
+        """
+        texto = texto.casefold()
+        if not texto.isascii():
+            texto = ''.join(letra for letra in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(letra))
+        return IndiceTexto.PALABRA.findall(texto)
+
+    def agregar(self, id: int, titulo: str, descripcion: str):
+        """
+        Indexa el título y la descripción de una tarea.
+
+        Args:
+            id (int): ID de la tarea.
+            titulo (str): Título de la tarea.
+            descripcion (str): Descripción de la tarea.
+        """
+        palabras_titulo = self.tokenizar(titulo)
+        posiciones_tarea = {}
+        for posicion, palabra in enumerate(palabras_titulo):
+            posiciones_tarea.setdefault(palabra, []).append(posicion)
+        # La descripción empieza una posición más allá para que una frase no una los dos campos
+        for posicion, palabra in enumerate(self.tokenizar(descripcion), len(palabras_titulo) + 1):
+            posiciones_tarea.setdefault(palabra, []).append(posicion)
+        for palabra, posiciones in posiciones_tarea.items():
+            self.posiciones.setdefault(palabra, {})[id] = posiciones
+        self.palabras[id] = tuple(posiciones_tarea)
+        self.longitudes_titulo[id] = len(palabras_titulo)
+
+    def quitar(self, id: int):
+        """
+        Quita una tarea del índice (no hace nada si no está).
+
+        Args:
+            id (int): ID de la tarea.
+        """
+        for palabra in self.palabras.pop(id, ()):
+            tareas = self.posiciones[palabra]
+            del tareas[id]
+            if not tareas:
+                del self.posiciones[palabra]
+        self.longitudes_titulo.pop(id, None)
+
+    def coincidencias(self, frase: list[str]) -> set[int]:
+        """
+        Devuelve las tareas que contienen una palabra o una frase exacta.
+
+        Args:
+            frase (list[str]): Palabras ya tokenizadas, en orden.
+
+        Returns:
+            set[int]: IDs de las tareas encontradas.
+        """
+        listas = [self.posiciones.get(palabra) for palabra in frase]
+        if not listas or None in listas:
+            return set()
+        # Empezar por la palabra con menos tareas
+        ids = set(min(listas, key=len)).intersection(*listas)
+        if len(frase) == 1:
+            return ids
+        encontradas = set()
+        for id in ids:
+            siguientes = [set(tareas[id]) for tareas in listas[1:]]
+            if any(all(inicio + salto in posiciones for salto, posiciones in enumerate(siguientes, 1))
+                   for inicio in listas[0][id]):
+                encontradas.add(id)
+        return encontradas
+
+    def puntuar(self, id: int, palabras: set[str], total: int = None) -> float:
+        """
+        Calcula la relevancia tf-idf de una tarea para unas palabras; las del título cuentan doble.
+
+        Args:
+            id (int): ID de la tarea.
+            palabras (set[str]): Palabras buscadas.
+            total (int, optional): Número de tareas para el idf (por defecto, las del índice).
+
+        Returns:
+            float: Puntuación de la tarea (mayor es más relevante).
+        """
+        if total is None:
+            total = len(self.palabras)
+        longitud_titulo = self.longitudes_titulo[id]
+        puntuacion = 0.0
+        for palabra in palabras:
+            tareas = self.posiciones.get(palabra)
+            if not tareas or id not in tareas:
+                continue
+            posiciones = tareas[id]
+            frecuencia = len(posiciones) + sum(1 for posicion in posiciones if posicion < longitud_titulo)
+            puntuacion += (1 + math.log(frecuencia)) * math.log(1 + total / len(tareas))
+        return puntuacion
+
+    @staticmethod
+    def analizar(consulta: str) -> list[list[tuple[bool, list[str]]]]:
+        """
+        Separa una consulta en grupos unidos por OR, cada uno con sus frases.
+
+        Args:
+            consulta (str): Texto de la consulta.
+
+        Returns:
+            list[list[tuple[bool, list[str]]]]: Por grupo, sus frases como (negada, palabras).
+        """
+        grupos = [[]]
+        negar = False
+        for menos, frase, termino in IndiceTexto.CONSULTA.findall(consulta):
+            if termino == 'OR':
+                grupos.append([])
+                continue
+            if termino == 'AND':
+                continue
+            if termino == 'NOT':
+                negar = True
+                continue
+            if termino.startswith('-'):
+                menos, termino = '-', termino[1:]
+            palabras = IndiceTexto.tokenizar(termino or frase)
+            if palabras:
+                grupos[-1].append((negar or menos == '-', palabras))
+            negar = False
+        return grupos
+
+    def buscar(self, consulta: str, limite: int = 10, total: int = None) -> list[tuple[int, float]]:
+        """
+        Busca tareas con una consulta y las ordena por relevancia.
+
+        Las palabras de la consulta deben aparecer todas; "entre comillas" busca una
+        frase exacta; -palabra o NOT palabra excluye; OR une los resultados de
+        varias consultas (pepe OR "lista compra").
+
+        Args:
+            consulta (str): Texto de la consulta.
+            limite (int, optional): Número máximo de resultados.
+            total (int, optional): Número de tareas para el idf (por defecto, las del índice).
+
+        Returns:
+            list[tuple[int, float]]: (ID de tarea, puntuación), de la más a la menos relevante.
+        """
+        puntuaciones = {}
+        for grupo in self.analizar(consulta):
+            positivas = [palabras for negada, palabras in grupo if not negada]
+            # Una consulta solo de exclusiones no selecciona nada
+            if not positivas:
+                continue
+            ids = set.intersection(*(self.coincidencias(palabras) for palabras in positivas))
+            for negada, palabras in grupo:
+                if negada:
+                    ids -= self.coincidencias(palabras)
+            buscadas = {palabra for palabras in positivas for palabra in palabras}
+            for id in ids:
+                puntuaciones[id] = max(puntuaciones.get(id, 0.0), self.puntuar(id, buscadas, total))
+        # A igual puntuación, primero la tarea más antigua
+        return nlargest(limite, puntuaciones.items(), key=lambda par: (par[1], -par[0]))
+
+
+class Accion(ABC):
+    """
+    Acción del historial que sabe deshacerse y rehacerse sobre un manejador.
+
+    Atributos:
+        tamano (int): Tamaño estimado en bytes de la acción.
+    """
+    __slots__ = ('tamano',)
+
+    @abstractmethod
+    def deshacer(self, manejador: 'ManejadorTareas'):
+        """Revierte la acción; devuelve False si ya no se puede (por ejemplo, su tarea urgente ya se consumió)."""
+
+    @abstractmethod
+    def rehacer(self, manejador: 'ManejadorTareas'):
+        """Vuelve a aplicar la acción; devuelve False si ya no se puede."""
+
+    def estimarTamano(self) -> int:
+        """Estima los bytes que la acción mantiene en memoria."""
+        return sys.getsizeof(self)
+
+    def efectoTarea(self, deshacer: bool) -> tuple:
+        """
+        Describe el estado en que la acción deja a su tarea, para aplicar varias acciones de una vez.
+
+        Args:
+            deshacer (bool): Estado tras deshacer la acción en lugar de tras rehacerla.
+
+        Returns:
+            tuple: (tarea, categoría donde queda o None, campos con su valor), o None si la acción no es de tareas.
+        """
+        return None
+
+
+class AccionAgregarTarea(Accion):
+    """
+    Acción de agregar una tarea a una categoría.
+
+    Atributos:
+        tarea (Tareas): Tarea agregada.
+        categoria (Categoria): Categoría de la tarea.
+    """
+    __slots__ = ('tarea', 'categoria')
+
+    def __init__(self, tarea: Tareas, categoria: Categoria):
+        self.tarea = tarea
+        self.categoria = categoria
+
+    def deshacer(self, manejador):
+        manejador.retirarTarea(self.tarea)
+
+    def rehacer(self, manejador):
+        manejador.insertarTarea(self.tarea, self.categoria)
+
+    def estimarTamano(self):
+        tarea = self.tarea
+        return sys.getsizeof(self) + sys.getsizeof(tarea) + sys.getsizeof(tarea.titulo) + sys.getsizeof(tarea.descripcion)
+
+    def efectoTarea(self, deshacer):
+        return (self.tarea, None if deshacer else self.categoria, {})
+
+
+class AccionEliminarTarea(AccionAgregarTarea):
+    """
+    Acción de eliminar una tarea de una categoría (la inversa de agregarla).
+    """
+    __slots__ = ()
+
+    def deshacer(self, manejador):
+        manejador.insertarTarea(self.tarea, self.categoria)
+
+    def rehacer(self, manejador):
+        manejador.retirarTarea(self.tarea)
+
+    def efectoTarea(self, deshacer):
+        return (self.tarea, self.categoria if deshacer else None, {})
+
+
+class AccionModificarTarea(Accion):
+    """
+    Acción de modificar campos de una tarea.
+
+    Atributos:
+        tarea (Tareas): Tarea modificada.
+        categoria (Categoria): Categoría de la tarea.
+        cambios (dict[str, tuple]): Campo -> (valor anterior, valor nuevo), solo para los campos cambiados.
+    """
+    __slots__ = ('tarea', 'categoria', 'cambios')
+
+    def __init__(self, tarea: Tareas, categoria: Categoria, cambios: dict):
+        self.tarea = tarea
+        self.categoria = categoria
+        self.cambios = cambios
+
+    def deshacer(self, manejador):
+        manejador.actualizarTarea(self.tarea, self.categoria, **{campo: anterior for campo, (anterior, _) in self.cambios.items()})
+
+    def rehacer(self, manejador):
+        manejador.actualizarTarea(self.tarea, self.categoria, **{campo: nuevo for campo, (_, nuevo) in self.cambios.items()})
+
+    def estimarTamano(self):
+        return sys.getsizeof(self) + sys.getsizeof(self.cambios) + sum(
+            sys.getsizeof(valores) + sys.getsizeof(valores[0]) for valores in self.cambios.values())
+
+    def efectoTarea(self, deshacer):
+        posicion = 0 if deshacer else 1
+        return (self.tarea, self.categoria, {campo: valores[posicion] for campo, valores in self.cambios.items()})
+
+
+class AccionAgregarCategoria(Accion):
+    """
+    Acción de agregar una categoría principal o una subcategoría.
+
+    Atributos:
+        categoria (Categoria): Categoría agregada.
+        padre (Categoria): Categoría padre, o None si es una categoría principal.
+    """
+    __slots__ = ('categoria', 'padre')
+
+    def __init__(self, categoria: Categoria, padre: Categoria = None):
+        self.categoria = categoria
+        self.padre = padre
+
+    def deshacer(self, manejador):
+        manejador.retirarCategoria(self.categoria, self.padre)
+
+    def rehacer(self, manejador):
+        manejador.insertarCategoria(self.categoria, self.padre)
+
+
+class AccionMoverCategoria(Accion):
+    """
+    Acción de mover una categoría con sus subcategorías bajo otro padre.
+
+    Atributos:
+        categoria (Categoria): Categoría movida.
+        anterior (Categoria): Padre anterior, o None si era una categoría principal.
+        posicion (int): Posición que ocupaba entre sus hermanas.
+        padre (Categoria): Nuevo padre, o None si pasó a ser principal.
+    """
+    __slots__ = ('categoria', 'anterior', 'posicion', 'padre')
+
+    def __init__(self, categoria: Categoria, anterior: Categoria, posicion: int, padre: Categoria = None):
+        self.categoria = categoria
+        self.anterior = anterior
+        self.posicion = posicion
+        self.padre = padre
+
+    def deshacer(self, manejador):
+        manejador.reubicarCategoria(self.categoria, self.anterior, self.posicion)
+
+    def rehacer(self, manejador):
+        manejador.reubicarCategoria(self.categoria, self.padre)
+
+
+class AccionAgregarUrgente(Accion):
+    """
+    Acción de agregar una tarea a la cola urgente de una categoría.
+
+    Atributos:
+        tarea (Tareas): Tarea urgente agregada.
+        categoria (Categoria): Categoría de la cola.
+    """
+    __slots__ = ('tarea', 'categoria')
+
+    def __init__(self, tarea: Tareas, categoria: Categoria):
+        self.tarea = tarea
+        self.categoria = categoria
+
+    def deshacer(self, manejador):
+        return manejador.retirarUrgente(self.categoria, self.tarea)
+
+    def rehacer(self, manejador):
+        manejador.ponerUrgente(self.categoria, self.tarea)
+
+    def estimarTamano(self):
+        tarea = self.tarea
+        return sys.getsizeof(self) + sys.getsizeof(tarea) + sys.getsizeof(tarea.titulo) + sys.getsizeof(tarea.descripcion)
+
+
+class AccionProcesarUrgentes(Accion):
+    """
+    Acción de procesar una o varias tareas urgentes de una categoría.
+
+    Deshacerla devuelve las tareas a la cola; rehacerla las vuelve a sacar sin
+    ejecutar de nuevo la función de la categoría.
+
+    Atributos:
+        tareas (tuple[Tareas]): Tareas procesadas, en orden de procesamiento.
+        categoria (Categoria): Categoría de la cola.
+    """
+    __slots__ = ('tareas', 'categoria')
+
+    def __init__(self, tareas: tuple, categoria: Categoria):
+        self.tareas = tareas
+        self.categoria = categoria
+
+    def deshacer(self, manejador):
+        for tarea in reversed(self.tareas):
+            manejador.devolverUrgente(self.categoria, tarea)
+
+    def rehacer(self, manejador):
+        for numero, tarea in enumerate(self.tareas):
+            if not manejador.retirarUrgente(self.categoria, tarea):
+                # Si alguna tarea ya no está en la cola, se devuelven las ya retiradas
+                for retirada in reversed(self.tareas[:numero]):
+                    manejador.devolverUrgente(self.categoria, retirada)
+                return False
+
+    def estimarTamano(self):
+        return sys.getsizeof(self) + sys.getsizeof(self.tareas) + sum(sys.getsizeof(tarea) for tarea in self.tareas)
+
+
+class RegistroEscritura:
+    """
+    Registro de escritura anticipada (WAL): un archivo de solo anexado con una
+    línea JSON [secuencia, operación, argumentos] por cada operación del manejador.
+
+    Las escrituras se confirman en grupo para que cada operación cueste poco:
+
+    - 'siempre': se vuelca y sincroniza con el disco (fsync) cada operación.
+    - 'grupo': se vuelca y sincroniza cada tamano_grupo operaciones o al llamar a confirmar().
+    - 'nunca': se vuelca al confirmar, pero se deja al sistema operativo decidir cuándo escribir al disco.
+
+    Args:
+        ruta (str): Ruta del archivo de registro.
+        sincronizar (str, optional): Política de sincronización ('siempre', 'grupo' o 'nunca').
+        tamano_grupo (int, optional): Operaciones por grupo con la política 'grupo'.
+        secuencia (int, optional): Número de la última operación ya escrita en el archivo.
+    """
+    POLITICAS = ('siempre', 'grupo', 'nunca')
+
+    def __init__(self, ruta: str, sincronizar: str = 'grupo', tamano_grupo: int = 64, secuencia: int = 0):
+        if sincronizar not in self.POLITICAS:
+            raise ValueError(f'Política de sincronización no válida: {sincronizar}')
+        self.ruta = ruta
+        self.sincronizar = sincronizar
+        self.tamano_grupo = tamano_grupo
+        self.secuencia = secuencia
+        self.pendientes = 0
+        self.archivo = open(ruta, 'a', encoding='utf-8')
+
+    @staticmethod
+    def codificar(valor):
+        """Convierte a JSON los valores que json no admite (fechas)."""
+        if isinstance(valor, datetime):
+            return {'fecha': valor.isoformat()}
+        raise TypeError(f'No se puede guardar en el registro: {valor!r}')
+
+    @staticmethod
+    def decodificar(objeto: dict):
+        """Reconstruye los valores guardados por codificar()."""
+        if len(objeto) == 1 and 'fecha' in objeto:
+            return datetime.fromisoformat(objeto['fecha'])
+        return objeto
+
+    def escribir(self, operacion: str, *argumentos):
+        """
+        Anexa una operación al registro.
+
+        Args:
+            operacion (str): Nombre del método del manejador.
+            *argumentos: Argumentos con los que se llamó.
+        """
+        self.secuencia += 1
+        self.archivo.write(json.dumps([self.secuencia, operacion, argumentos], ensure_ascii=False,
+                                      default=self.codificar) + '\n')
+        self.pendientes += 1
+        if self.sincronizar == 'siempre' or (self.sincronizar == 'grupo' and self.pendientes >= self.tamano_grupo):
+            self.confirmar()
+
+    def confirmar(self):
+        """Vuelca las operaciones pendientes y, según la política, las sincroniza con el disco."""
+        if not self.pendientes:
+            return
+        self.archivo.flush()
+        if self.sincronizar != 'nunca':
+            os.fsync(self.archivo.fileno())
+        self.pendientes = 0
+
+    def truncar(self):
+        """Vacía el registro tras guardar una instantánea; la secuencia sigue desde donde estaba."""
+        self.archivo.flush()
+        self.archivo.truncate(0)
+        os.fsync(self.archivo.fileno())
+        self.pendientes = 0
+
+    def cerrar(self):
+        """Confirma lo pendiente y cierra el archivo."""
+        self.confirmar()
+        self.archivo.close()
+
+    @classmethod
+    def leer(cls, ruta: str):
+        """
+        Recorre las operaciones guardadas en un registro.
+
+        Si la última línea quedó incompleta por una caída, se descarta y se recorta el archivo.
+
+        Args:
+            ruta (str): Ruta del archivo de registro.
+
+        Yields:
+            tuple: (secuencia, operación, argumentos) de cada operación.
+        """
+        if not os.path.exists(ruta):
+            return
+        with open(ruta, 'rb+') as archivo:
+            valido = 0
+            for linea in archivo:
+                try:
+                    if not linea.endswith(b'\n'):
+                        raise ValueError
+                    secuencia, operacion, argumentos = json.loads(linea, object_hook=cls.decodificar)
+                except ValueError:
+                    archivo.truncate(valido)
+                    return
+                valido += len(linea)
+                yield secuencia, operacion, argumentos
+
+
+class InstantaneaBinaria:
+    """
+    Instantánea binaria del estado de un manejador, leída mediante mmap.
+
+    El archivo tiene una cabecera fija, columnas de ancho fijo para categorías
+    (ID, fila del padre o -1, nombre y filas de sus tareas) y para tareas (ID,
+    vencimiento en microsegundos desde EPOCA, fila de la categoría, título,
+    descripción, prioridad y si es urgente), las filas de las tareas ordenadas por
+    ID y al final un montón con las cadenas UTF-8 sin repetir. Las columnas se
+    leen del mapa sin copiarlas ni analizar texto.
+
+    cargarEn crea al abrir solo el árbol de categorías. Las tareas de cada categoría
+    están en filas contiguas y se construyen la primera vez que se usa la categoría,
+    así que abrir no depende del número de tareas. El archivo se cierra cuando todas
+    las categorías han cargado sus tareas.
+
+    Las columnas usan el orden de bytes de la máquina que escribió el archivo.
+
+    Args:
+        ruta (str): Archivo de la instantánea.
+
+    Atributos:
+        manejador (ManejadorTareas): Manejador donde se cargan las tareas, o None antes de cargarEn.
+        pendientes (dict[int, tuple[Categoria, int]]): ID de categoría -> categoría y su fila,
+            para las categorías que aún no han cargado sus tareas.
+    """
+    MAGICO = b'MTAR'
+    # Mágico, marca de orden de bytes, secuencia, idCategoria, idTarea, categorías, tareas, bytes de cadenas
+    CABECERA = struct.Struct('=4sIqqqqqq')
+    COLUMNAS_CATEGORIAS = ('ids', 'padres', 'nombres', 'longitudes_nombres', 'inicios_tareas', 'fines_tareas')
+    COLUMNAS_TAREAS = ('ids', 'vencimientos', 'categorias', 'titulos', 'longitudes_titulos',
+                       'descripciones', 'longitudes_descripciones', 'filas_por_id')
+
+    def __init__(self, ruta: str):
+        self.archivo = open(ruta, 'rb')
+        self.mapa = mmap.mmap(self.archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        (magico, orden, self.secuencia, self.idCategoria, self.idTarea,
+         num_categorias, num_tareas, bytes_cadenas) = self.CABECERA.unpack_from(self.mapa)
+        if magico != self.MAGICO or orden != 1:
+            self.mapa.close()
+            self.archivo.close()
+            raise ValueError(f'{ruta} no es una instantánea binaria válida para esta máquina.')
+        vista = memoryview(self.mapa)
+        posicion = self.CABECERA.size
+
+        def columna(formato: str, filas: int):
+            nonlocal posicion
+            tamano = filas * struct.calcsize(formato)
+            datos = vista[posicion:posicion + tamano].cast(formato)
+            posicion += tamano
+            return datos
+
+        self.categorias = {nombre: columna('q', num_categorias) for nombre in self.COLUMNAS_CATEGORIAS}
+        self.tareas = {nombre: columna('q', num_tareas) for nombre in self.COLUMNAS_TAREAS}
+        self.prioridades = columna('b', num_tareas)
+        self.urgentes = columna('b', num_tareas)
+        self.inicio_cadenas = posicion
+        self.manejador: ManejadorTareas = None
+        self.pendientes: dict[int, tuple] = {}
+        # Las cadenas y fechas repetidas se decodifican una sola vez
+        self.cadenas: dict[int, str] = {}
+        self.fechas: dict[int, datetime] = {}
+
+    def __len__(self):
+        return len(self.prioridades)
+
+    def cadena(self, posicion: int, longitud: int) -> str:
+        """Lee una cadena del montón de cadenas."""
+        valor = self.cadenas.get(posicion)
+        if valor is None:
+            inicio = self.inicio_cadenas + posicion
+            valor = self.cadenas[posicion] = self.mapa[inicio:inicio + longitud].decode('utf-8')
+        return valor
+
+    def fecha(self, microsegundos: int) -> datetime:
+        """Convierte un vencimiento guardado en fecha."""
+        valor = self.fechas.get(microsegundos)
+        if valor is None:
+            valor = self.fechas[microsegundos] = EPOCA + microsegundos * MICROSEGUNDO
+        return valor
+
+    def tarea(self, fila: int) -> Tareas:
+        """
+        Construye el objeto Tareas de una fila.
+
+        Args:
+            fila (int): Número de la fila de la tarea.
+
+        Returns:
+            Tareas: La tarea de esa fila.
+        """
+        columnas = self.tareas
+        return Tareas(columnas['ids'][fila],
+                      self.cadena(columnas['titulos'][fila], columnas['longitudes_titulos'][fila]),
+                      self.cadena(columnas['descripciones'][fila], columnas['longitudes_descripciones'][fila]),
+                      self.prioridades[fila], self.fecha(columnas['vencimientos'][fila]))
+
+    def cargarEn(self, manejador: 'ManejadorTareas'):
+        """
+        Carga en un manejador vacío las categorías de la instantánea; sus tareas
+        se cargan la primera vez que se usa cada categoría.
+
+        Args:
+            manejador (ManejadorTareas): Manejador donde cargar las categorías y tareas.
+        """
+        columnas = self.categorias
+        categorias = []
+        for fila in range(len(columnas['ids'])):
+            categoria = Categoria(columnas['ids'][fila], self.cadena(columnas['nombres'][fila], columnas['longitudes_nombres'][fila]),
+                                  cargador=self)
+            # Las subcategorías se crean ya; solo las tareas esperan a que se usen
+            categoria.subcategorias = []
+            padre = columnas['padres'][fila]
+            # Los padres siempre se escriben antes que sus subcategorías
+            manejador.insertarCategoria(categoria, categorias[padre] if padre >= 0 else None)
+            categorias.append(categoria)
+            self.pendientes[categoria.id] = (categoria, fila)
+        manejador.idCategoria = self.idCategoria
+        manejador.idTarea = self.idTarea
+        manejador.secuencia_instantanea = self.secuencia
+        self.manejador = manejador
+        manejador.instantanea = self
+        if not self.pendientes:
+            self.cerrar()
+
+    def cargarContenido(self, categoria: Categoria):
+        """
+        Construye las tareas y la cola urgente de una categoría desde sus filas.
+
+        Args:
+            categoria (Categoria): Categoría cuyas tareas se cargan.
+        """
+        _, fila = self.pendientes.pop(categoria.id)
+        categoria.tareas = []
+        categoria.tareas_ordenadas = []
+        categoria.tareasUrgentes = self.manejador.claseColaUrgente()
+        categoria.cargador = None
+        # Las tareas de la categoría están en orden de ID y después sus urgentes, en el orden de la cola
+        tareas = []
+        for fila_tarea in range(self.categorias['inicios_tareas'][fila], self.categorias['fines_tareas'][fila]):
+            if self.urgentes[fila_tarea]:
+                categoria.tareasUrgentes.put(self.tarea(fila_tarea))
+            else:
+                tareas.append(self.tarea(fila_tarea))
+        self.manejador.cargarTareas(tareas, categoria)
+        if not self.pendientes:
+            self.cerrar()
+
+    def cargarPendientes(self):
+        """Carga las tareas de todas las categorías que aún no las tienen y cierra el archivo."""
+        for categoria, _ in list(self.pendientes.values()):
+            self.cargarContenido(categoria)
+
+    def categoriaDeTarea(self, idTarea: int) -> int:
+        """
+        Busca por ID en qué categoría estaba una tarea al escribir la instantánea.
+
+        Args:
+            idTarea (int): ID de la tarea.
+
+        Returns:
+            int: ID de la categoría, o None si la tarea no está en la instantánea.
+        """
+        ids, filas = self.tareas['ids'], self.tareas['filas_por_id']
+        posicion = bisect_left(filas, idTarea, key=ids.__getitem__)
+        if posicion == len(filas) or ids[filas[posicion]] != idTarea:
+            return None
+        return self.categorias['ids'][self.tareas['categorias'][filas[posicion]]]
+
+    def cerrar(self):
+        """Libera las columnas y cierra el archivo."""
+        for columna in (*self.categorias.values(), *self.tareas.values(), self.prioridades, self.urgentes):
+            columna.release()
+        self.mapa.close()
+        self.archivo.close()
+        self.cadenas.clear()
+        self.fechas.clear()
+        if self.manejador is not None and self.manejador.instantanea is self:
+            self.manejador.instantanea = None
+
+    @classmethod
+    def escribir(cls, manejador: 'ManejadorTareas', ruta: str, secuencia: int):
+        """
+        Escribe el estado de un manejador en formato binario.
+
+        Args:
+            manejador (ManejadorTareas): Manejador a guardar.
+            ruta (str): Archivo de destino.
+            secuencia (int): Última operación del registro incluida en la instantánea.
+        """
+        categorias = {nombre: array('q') for nombre in cls.COLUMNAS_CATEGORIAS}
+        # Las tareas se reúnen en una TablaTareas, que ya evita repetir cadenas
+        tabla = TablaTareas()
+        urgentes = array('b')
+        filas_categorias = array('q')
+        pendientes = deque((categoria, -1) for categoria in manejador.categorias)
+        while pendientes:
+            categoria, padre = pendientes.popleft()
+            fila = len(categorias['ids'])
+            categorias['ids'].append(categoria.id)
+            categorias['padres'].append(padre)
+            categorias['nombres'].append(tabla.internar(categoria.nombre))
+            # Las tareas de cada categoría ocupan filas contiguas
+            categorias['inicios_tareas'].append(len(tabla))
+            for lista, urgente in ((categoria.tareas, 0), (categoria.tareasUrgentes.tareasEnOrden(), 1)):
+                for tarea in lista:
+                    tabla.agregar(tarea)
+                    urgentes.append(urgente)
+                    filas_categorias.append(fila)
+            categorias['fines_tareas'].append(len(tabla))
+            pendientes.extend((subcategoria, fila) for subcategoria in categoria.subcategorias)
+        # Montón de cadenas: posición y longitud en bytes de cada cadena de la tabla
+        codificadas = [cadena.encode('utf-8') for cadena in tabla.cadenas]
+        posiciones, longitudes = array('q'), array('q')
+        posicion = 0
+        for datos in codificadas:
+            posiciones.append(posicion)
+            longitudes.append(len(datos))
+            posicion += len(datos)
+        categorias['longitudes_nombres'] = array('q', (longitudes[i] for i in categorias['nombres']))
+        categorias['nombres'] = array('q', (posiciones[i] for i in categorias['nombres']))
+        tareas = {
+            'ids': tabla.ids,
+            'vencimientos': tabla.vencimientos,
+            'categorias': filas_categorias,
+            'titulos': array('q', (posiciones[i] for i in tabla.titulos)),
+            'longitudes_titulos': array('q', (longitudes[i] for i in tabla.titulos)),
+            'descripciones': array('q', (posiciones[i] for i in tabla.descripciones)),
+            'longitudes_descripciones': array('q', (longitudes[i] for i in tabla.descripciones)),
+            # Para buscar la categoría de una tarea por ID sin cargar ninguna
+            'filas_por_id': array('q', sorted(range(len(tabla)), key=tabla.ids.__getitem__)),
+        }
+        with open(ruta, 'wb') as archivo:
+            archivo.write(cls.CABECERA.pack(cls.MAGICO, 1, secuencia, manejador.idCategoria, manejador.idTarea,
+                                            len(categorias['ids']), len(tabla), posicion))
+            for nombre in cls.COLUMNAS_CATEGORIAS:
+                categorias[nombre].tofile(archivo)
+            for nombre in cls.COLUMNAS_TAREAS:
+                tareas[nombre].tofile(archivo)
+            tabla.prioridades.tofile(archivo)
+            urgentes.tofile(archivo)
+            for datos in codificadas:
+                archivo.write(datos)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+
+class AlmacenSQLite:
+    """
+    Almacenamiento de categorías y tareas en una base de datos SQLite.
+
+    Las tablas tienen índices por nombre de categoría y por (categoría, prioridad,
+    vencimiento), de modo que las búsquedas de categorías, los listados ordenados
+    y el acceso a una tarea por ID son consultas indexadas. Las fechas se guardan
+    como microsegundos desde EPOCA.
+
+    Args:
+        ruta (str): Archivo de la base de datos (':memory:' para una base temporal).
+    """
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS categorias (
+            id INTEGER PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            padre INTEGER REFERENCES categorias(id)
+        );
+        CREATE INDEX IF NOT EXISTS categorias_nombre ON categorias (nombre);
+        CREATE INDEX IF NOT EXISTS categorias_nombre_clave ON categorias (nombre COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS categorias_padre ON categorias (padre);
+        CREATE TABLE IF NOT EXISTS tareas (
+            id INTEGER PRIMARY KEY,
+            categoria INTEGER NOT NULL REFERENCES categorias(id),
+            titulo TEXT NOT NULL,
+            descripcion TEXT NOT NULL,
+            prioridad INTEGER NOT NULL,
+            vencimiento INTEGER NOT NULL,
+            urgente INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS tareas_orden ON tareas (categoria, urgente, prioridad, vencimiento, id);
+        CREATE INDEX IF NOT EXISTS tareas_titulo_clave ON tareas (titulo COLLATE NOCASE) WHERE urgente IS NULL;
+        CREATE VIRTUAL TABLE IF NOT EXISTS tareas_palabras USING fts5(palabras, tokenize = "unicode61 tokenchars '_'");
+        CREATE TABLE IF NOT EXISTS contadores (
+            clave TEXT PRIMARY KEY,
+            valor INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta)
+        nuevo = self.conexion.execute("SELECT 1 FROM sqlite_master WHERE name = 'tareas_palabras'").fetchone() is None
+        self.conexion.executescript(self.ESQUEMA)
+        # Una base de datos creada sin el índice de palabras lo rellena una vez con las tareas guardadas
+        if nuevo:
+            filas = self.conexion.execute('SELECT id, titulo, descripcion FROM tareas WHERE urgente IS NULL').fetchall()
+            with self.conexion:
+                self.conexion.executemany('INSERT INTO tareas_palabras (rowid, palabras) VALUES (?, ?)',
+                                          [self.filaPalabras(*fila) for fila in filas])
+
+    @staticmethod
+    def filaTarea(tarea: Tareas, idCategoria: int, urgente: int = None) -> tuple:
+        """Convierte una tarea en una fila de la tabla tareas (urgente es su orden en la cola, o None)."""
+        return (tarea.id, idCategoria, tarea.titulo, tarea.descripcion, tarea.prioridad,
+                (tarea.fecha_vencimiento - EPOCA) // MICROSEGUNDO, urgente)
+
+    @staticmethod
+    def filaPalabras(id: int, titulo: str, descripcion: str) -> tuple:
+        """Convierte una tarea en una fila de tareas_palabras: sus palabras tokenizadas como en IndiceTexto."""
+        return id, ' '.join(IndiceTexto.tokenizar(f'{titulo} {descripcion}'))
+
+    @staticmethod
+    def tareaDeFila(id: int, titulo: str, descripcion: str, prioridad: int, vencimiento: int) -> Tareas:
+        """Construye una tarea a partir de las columnas de la tabla tareas."""
+        return Tareas(id, titulo, descripcion, prioridad, EPOCA + vencimiento * MICROSEGUNDO)
+
+    def guardar(self, manejador: 'ManejadorTareas'):
+        """
+        Reemplaza el contenido de la base de datos por el estado completo del manejador en una transacción.
+
+        Args:
+            manejador (ManejadorTareas): Manejador a guardar.
+        """
+        categorias, tareas = [], []
+        pendientes = [(categoria, None) for categoria in reversed(manejador.categorias)]
+        while pendientes:
+            categoria, padre = pendientes.pop()
+            categorias.append((categoria.id, categoria.nombre, padre))
+            tareas.extend(self.filaTarea(tarea, categoria.id) for tarea in categoria.tareas)
+            tareas.extend(self.filaTarea(tarea, categoria.id, orden)
+                          for orden, tarea in enumerate(categoria.tareasUrgentes.tareasEnOrden()))
+            pendientes.extend((subcategoria, categoria.id) for subcategoria in reversed(categoria.subcategorias))
+        with self.conexion:
+            self.conexion.execute('DELETE FROM tareas')
+            self.conexion.execute('DELETE FROM tareas_palabras')
+            self.conexion.execute('DELETE FROM categorias')
+            self.conexion.executemany('INSERT INTO categorias VALUES (?, ?, ?)', categorias)
+            self.conexion.executemany('INSERT INTO tareas VALUES (?, ?, ?, ?, ?, ?, ?)', tareas)
+            self.conexion.executemany('INSERT INTO tareas_palabras (rowid, palabras) VALUES (?, ?)',
+                                      (self.filaPalabras(fila[0], fila[2], fila[3]) for fila in tareas if fila[6] is None))
+            self.guardarContadores(manejador)
+
+    def guardarCambios(self, manejador: 'ManejadorTareas'):
+        """
+        Escribe en una transacción solo las categorías, tareas y colas urgentes
+        que el manejador marcó como cambiadas, junto con los contadores.
+
+        Args:
+            manejador (ManejadorTareas): Manejador con los cambios pendientes.
+        """
+        categorias_id = manejador.indice_categorias_id
+        categorias, categorias_borradas = [], []
+        for id, (categoria, padre) in manejador.categorias_cambiadas.items():
+            if categorias_id.get(id) is categoria:
+                categorias.append((id, categoria.nombre, padre.id if padre else None))
+            else:
+                categorias_borradas.append((id,))
+        tareas, tareas_borradas = [], []
+        for id in manejador.tareas_cambiadas:
+            tarea, categoria = manejador.indice_tareas.get(id, (None, None))
+            if tarea is None:
+                tareas_borradas.append((id,))
+            else:
+                tareas.append(self.filaTarea(tarea, categoria.id))
+        # Las colas urgentes cambiadas se reescriben enteras para conservar su orden
+        colas = [(id,) for id in manejador.colas_cambiadas]
+        for id, categoria in manejador.colas_cambiadas.items():
+            if categorias_id.get(id) is categoria:
+                tareas.extend(self.filaTarea(tarea, id, orden)
+                              for orden, tarea in enumerate(categoria.tareasUrgentes.tareasEnOrden()))
+        with self.conexion:
+            # Las palabras de una tarea salen del índice aunque la tarea pase a una cola urgente
+            self.conexion.executemany('DELETE FROM tareas_palabras WHERE rowid = ?', tareas_borradas)
+            self.conexion.executemany('DELETE FROM tareas_palabras WHERE rowid IN '
+                                      '(SELECT id FROM tareas WHERE categoria = ?)', categorias_borradas)
+            self.conexion.executemany('DELETE FROM tareas WHERE id = ? AND urgente IS NULL', tareas_borradas)
+            self.conexion.executemany('DELETE FROM tareas WHERE categoria = ? AND urgente IS NOT NULL', colas)
+            self.conexion.executemany('DELETE FROM tareas WHERE categoria = ?', categorias_borradas)
+            self.conexion.executemany('DELETE FROM categorias WHERE id = ?', categorias_borradas)
+            self.conexion.executemany('INSERT OR REPLACE INTO categorias VALUES (?, ?, ?)', categorias)
+            self.conexion.executemany('INSERT OR REPLACE INTO tareas VALUES (?, ?, ?, ?, ?, ?, ?)', tareas)
+            self.conexion.executemany('INSERT OR REPLACE INTO tareas_palabras (rowid, palabras) VALUES (?, ?)',
+                                      (self.filaPalabras(fila[0], fila[2], fila[3]) for fila in tareas if fila[6] is None))
+            self.guardarContadores(manejador)
+
+    def guardarContadores(self, manejador: 'ManejadorTareas'):
+        """Guarda los contadores de IDs del manejador (dentro de la transacción en curso)."""
+        self.conexion.executemany('INSERT OR REPLACE INTO contadores VALUES (?, ?)',
+                                  (('idCategoria', manejador.idCategoria), ('idTarea', manejador.idTarea)))
+
+    def cargarEn(self, manejador: 'ManejadorTareas'):
+        """
+        Carga el contenido de la base de datos en un manejador vacío.
+
+        Args:
+            manejador (ManejadorTareas): Manejador donde cargar las categorías y tareas.
+        """
+        categorias = {}
+        hijas = {}
+        for id, nombre, padre in self.conexion.execute('SELECT id, nombre, padre FROM categorias ORDER BY id'):
+            categorias[id] = Categoria(id, nombre, manejador.claseColaUrgente())
+            hijas.setdefault(padre, []).append(id)
+        # Insertar cada padre antes que sus subcategorías (una categoría movida puede tener un ID menor que su padre)
+        pendientes = deque((None, id) for id in hijas.get(None, ()))
+        while pendientes:
+            padre, id = pendientes.popleft()
+            manejador.insertarCategoria(categorias[id], padre)
+            pendientes.extend((categorias[id], hija) for hija in hijas.get(id, ()))
+        tareas_categoria = {}
+        for idCategoria, *columnas in self.conexion.execute(
+                'SELECT categoria, id, titulo, descripcion, prioridad, vencimiento FROM tareas '
+                'WHERE urgente IS NULL ORDER BY categoria, id'):
+            tareas_categoria.setdefault(idCategoria, []).append(self.tareaDeFila(*columnas))
+        for idCategoria, tareas in tareas_categoria.items():
+            manejador.cargarTareas(tareas, categorias[idCategoria])
+        for idCategoria, *columnas in self.conexion.execute(
+                'SELECT categoria, id, titulo, descripcion, prioridad, vencimiento FROM tareas '
+                'WHERE urgente IS NOT NULL ORDER BY categoria, urgente'):
+            categorias[idCategoria].tareasUrgentes.put(self.tareaDeFila(*columnas))
+        contadores = self.contadores()
+        manejador.idCategoria = contadores.get('idCategoria', manejador.idCategoria)
+        manejador.idTarea = contadores.get('idTarea', manejador.idTarea)
+
+    def contadores(self) -> dict:
+        """Devuelve los contadores de IDs guardados."""
+        return dict(self.conexion.execute('SELECT clave, valor FROM contadores'))
+
+    def subcategorias(self, idPadre: int = None) -> list[tuple]:
+        """
+        Devuelve las subcategorías directas de una categoría, o las principales si idPadre es None.
+
+        Returns:
+            list[tuple]: Filas (id, nombre) en orden de ID.
+        """
+        if idPadre is None:
+            return self.conexion.execute('SELECT id, nombre FROM categorias WHERE padre IS NULL ORDER BY id').fetchall()
+        return self.conexion.execute('SELECT id, nombre FROM categorias WHERE padre = ? ORDER BY id', (idPadre,)).fetchall()
+
+    def contenido(self, idCategoria: int) -> tuple[list[Tareas], list[Tareas]]:
+        """
+        Devuelve las tareas de una categoría en orden de ID y sus tareas urgentes en orden de cola.
+
+        Returns:
+            tuple[list[Tareas], list[Tareas]]: Tareas y tareas urgentes.
+        """
+        tareas, urgentes = [], []
+        for urgente, *columnas in self.conexion.execute(
+                'SELECT urgente, id, titulo, descripcion, prioridad, vencimiento FROM tareas '
+                'WHERE categoria = ? ORDER BY urgente IS NOT NULL, urgente, id', (idCategoria,)):
+            (tareas if urgente is None else urgentes).append(self.tareaDeFila(*columnas))
+        return tareas, urgentes
+
+    def buscarCategoria(self, id: int) -> tuple:
+        """
+        Busca una categoría por ID.
+
+        Returns:
+            tuple: (id, nombre, id del padre o None), o None si no existe.
+        """
+        return self.conexion.execute('SELECT id, nombre, padre FROM categorias WHERE id = ?', (id,)).fetchone()
+
+    def idsCategorias(self, nombre: str) -> list[int]:
+        """Devuelve los IDs de todas las categorías con un nombre, en orden."""
+        return [id for id, in self.conexion.execute('SELECT id FROM categorias WHERE nombre = ? ORDER BY id', (nombre,))]
+
+    def categoriasConPrefijo(self, prefijo: str):
+        """
+        Recorre las categorías cuyo nombre empieza por un prefijo, sin distinguir mayúsculas
+        (solo en letras ASCII, como COLLATE NOCASE), en orden alfabético.
+
+        Returns:
+            Iterator[tuple]: Filas (id, nombre), leídas del índice a medida que se piden.
+        """
+        # Todo nombre que empieza por el prefijo es menor que el prefijo seguido del mayor carácter
+        return self.conexion.execute('SELECT id, nombre FROM categorias WHERE nombre >= ? COLLATE NOCASE '
+                                     'AND nombre < ? COLLATE NOCASE ORDER BY nombre COLLATE NOCASE, id',
+                                     (prefijo, prefijo + '\U0010ffff'))
+
+    def titulosConPrefijo(self, prefijo: str):
+        """
+        Recorre las tareas (no urgentes) cuyo título empieza por un prefijo, sin distinguir
+        mayúsculas (solo en letras ASCII, como COLLATE NOCASE), en orden alfabético.
+
+        Returns:
+            Iterator[tuple]: Filas (id de la categoría, título), leídas del índice a medida que se piden.
+        """
+        return self.conexion.execute('SELECT categoria, titulo FROM tareas WHERE titulo >= ? COLLATE NOCASE '
+                                     'AND titulo < ? COLLATE NOCASE AND urgente IS NULL '
+                                     'ORDER BY titulo COLLATE NOCASE', (prefijo, prefijo + '\U0010ffff'))
+
+    def textosConPalabras(self, palabras: set[str]) -> list[tuple]:
+        """
+        Busca en tareas_palabras las tareas (no urgentes) que contienen alguna de unas palabras.
+
+        Args:
+            palabras (set[str]): Palabras ya tokenizadas con IndiceTexto.tokenizar.
+
+        Returns:
+            list[tuple]: Filas (id, id de la categoría, título, descripción).
+        """
+        if not palabras:
+            return []
+        consulta = ' OR '.join(f'"{palabra}"' for palabra in palabras)
+        return self.conexion.execute('SELECT tareas.id, categoria, titulo, descripcion FROM tareas_palabras '
+                                     'JOIN tareas ON tareas.id = tareas_palabras.rowid '
+                                     'WHERE tareas_palabras MATCH ? AND urgente IS NULL', (consulta,)).fetchall()
+
+    def contarTareas(self) -> dict[int, int]:
+        """Devuelve el número de tareas (no urgentes) guardadas de cada categoría."""
+        return dict(self.conexion.execute('SELECT categoria, count(*) FROM tareas WHERE urgente IS NULL GROUP BY categoria'))
+
+    def buscarTarea(self, id: int) -> tuple:
+        """
+        Busca una tarea (no urgente) por ID.
+
+        Returns:
+            tuple: (Tareas, id de su categoría), o None si no existe.
+        """
+        fila = self.conexion.execute('SELECT categoria, id, titulo, descripcion, prioridad, vencimiento FROM tareas '
+                                     'WHERE id = ? AND urgente IS NULL', (id,)).fetchone()
+        return (self.tareaDeFila(*fila[1:]), fila[0]) if fila else None
+
+    def tareasOrdenadas(self, idCategoria: int, limite: int = None, desplazamiento: int = 0) -> list[Tareas]:
+        """
+        Devuelve una página de tareas de una categoría ordenadas por prioridad y fecha de vencimiento.
+
+        Args:
+            idCategoria (int): ID de la categoría.
+            limite (int, optional): Número máximo de tareas (todas si es None).
+            desplazamiento (int, optional): Tareas a saltar desde el inicio.
+
+        Returns:
+            list[Tareas]: Las tareas de la página.
+        """
+        filas = self.conexion.execute(
+            'SELECT id, titulo, descripcion, prioridad, vencimiento FROM tareas '
+            'WHERE categoria = ? AND urgente IS NULL ORDER BY prioridad, vencimiento, id LIMIT ? OFFSET ?',
+            (idCategoria, -1 if limite is None else limite, desplazamiento))
+        return [self.tareaDeFila(*fila) for fila in filas]
+
+    def cerrar(self):
+        """Cierra la conexión con la base de datos."""
+        self.conexion.close()
+
+
+class ManejadorTareas:
+    """
+    Clase que administra categorías, subcategorías, tareas y permite la gestión de un historial de acciones.
+
+    Atributos:
+        categorias (list[Categoria]): Lista de todas las categorías.
+        idCategoria (int): Contador para el ID de la próxima categoría.
+        idTarea (int): Contador para el ID de la próxima tarea.
+        historial_acciones (LifoQueue[Accion]): Historial de acciones realizadas.
+        historial_deshacer (LifoQueue[Accion]): Historial de acciones deshechas que se pueden rehacer.
+        indice_categorias_nombre (dict[str, list[Categoria]]): Categorías con cada nombre, en orden de ID.
+        indice_categorias_id (dict[int, Categoria]): Índice de categorías por ID.
+        indice_tareas (dict[int, tuple[Tareas, Categoria]]): Índice de tareas por ID con su categoría.
+        claseColaUrgente (type): Tipo de cola usado para las tareas urgentes de cada categoría.
+        funciones_urgentes (dict[int, Callable]): Función que ejecuta las tareas urgentes de cada categoría, por ID.
+        bytes_historial (int): Tamaño estimado en bytes de las acciones guardadas en ambos historiales.
+        acciones_descartadas (int): Acciones antiguas descartadas por superar los límites del historial.
+        registro (RegistroEscritura): Registro donde se anotan las operaciones, o None si no hay persistencia.
+        ruta_instantanea (str): Archivo de la instantánea del estado, o None si no se usan instantáneas.
+        almacen (AlmacenSQLite): Base de datos donde se guarda el estado, o None si solo se usa memoria.
+        hidratadas (OrderedDict[int, Categoria]): Categorías con tareas cargadas desde el almacén, de la
+            menos a la más recientemente usada, o None si el almacén se cargó completo.
+        max_hidratadas (int): Número máximo de categorías sin cambios con tareas cargadas a la vez.
+        instantanea (InstantaneaBinaria): Instantánea binaria abierta con categorías que aún no han
+            cargado sus tareas, o None.
+        categorias_fijadas (set[int]): Categorías con cambios sin guardar, que no se descargan hasta guardarAlmacen.
+        referencias_historial (dict[int, int]): Con carga perezosa, ID de categoría -> acciones de los
+            historiales sobre ella; esas acciones guardan sus tareas, así que la categoría no se descarga.
+        efectos (list[list]): Cambios hechos por el deshacer o rehacer en curso, para anotarlos
+            en el registro, o None si no se está deshaciendo ni rehaciendo.
+        nombres_resueltos (set[str]): Con carga perezosa, nombres ya buscados en el almacén, cuya
+            categoría (si existe) ya está en el índice de nombres.
+        indice_rutas (dict[str, Categoria]): Ruta completa -> categoría (la de menor ID si se repite).
+        prefijos_categorias (IndicePrefijos): Nombres de las categorías en memoria, para autocompletar.
+        prefijos_tareas (IndicePrefijos): Títulos de las tareas en memoria, para autocompletar.
+        indice_texto (IndiceTexto): Palabras del título y la descripción de las tareas en memoria.
+        tareas_cambiadas (set[int]): IDs de tareas agregadas, modificadas o eliminadas desde el último guardado.
+        colas_cambiadas (dict[int, Categoria]): Categorías cuya cola urgente cambió desde el último guardado.
+        categorias_cambiadas (dict[int, tuple]): ID -> (categoría, padre) de las categorías agregadas
+            o retiradas desde el último guardado.
+        instantanea_binaria (bool): Guardar las instantáneas en formato binario (InstantaneaBinaria) en lugar de JSON.
+        instantanea_cada (int): Operaciones anotadas entre instantáneas automáticas (ninguna si es None).
+        secuencia_instantanea (int): Última operación del registro incluida en la instantánea.
+
+    Args:
+        urgentes_fifo (bool, optional): Procesar las tareas urgentes en orden de llegada en lugar de por prioridad.
+        concurrente (bool, optional): Usar colas sincronizadas entre hilos en lugar de las colas simples.
+        max_historial (int, optional): Número máximo de acciones que se pueden deshacer (sin límite si es None).
+        max_bytes_historial (int, optional): Tamaño estimado máximo de los historiales (sin límite si es None).
+    """
+    def __init__(self, urgentes_fifo: bool = False, concurrente: bool = False,
+                 max_historial: int = None, max_bytes_historial: int = None) -> None:
+        self.categorias: list[Categoria] = []
+        self.idCategoria = 1
+        self.idTarea = 1
+        # Las colas sincronizadas solo hacen falta si varios hilos usan el manejador
+        claseHistorial = LifoQueue if concurrente else PilaSimple
+        self.historial_acciones = claseHistorial()
+        self.historial_deshacer = claseHistorial()
+        self.max_historial = max_historial
+        self.max_bytes_historial = max_bytes_historial
+        self.bytes_historial = 0
+        self.acciones_descartadas = 0
+        self.indice_categorias_nombre: dict[str, list[Categoria]] = {}
+        self.indice_categorias_id: dict[int, Categoria] = {}
+        self.indice_tareas: dict[int, tuple[Tareas, Categoria]] = {}
+        if concurrente:
+            self.claseColaUrgente = ColaUrgenteFIFO if urgentes_fifo else ColaUrgentePrioridad
+        else:
+            self.claseColaUrgente = ColaUrgenteFIFOSimple if urgentes_fifo else ColaUrgentePrioridadSimple
+        self.funciones_urgentes: dict = {}
+        self.registro: RegistroEscritura = None
+        self.ruta_instantanea: str = None
+        self.instantanea_binaria = False
+        self.almacen: AlmacenSQLite = None
+        self.hidratadas: OrderedDict = None
+        self.max_hidratadas: int = None
+        self.instantanea: InstantaneaBinaria = None
+        self.categorias_fijadas: set[int] = set()
+        self.referencias_historial: dict[int, int] = {}
+        self.indice_rutas: dict[str, Categoria] = {}
+        self.prefijos_categorias = IndicePrefijos()
+        self.prefijos_tareas = IndicePrefijos()
+        self.indice_texto = IndiceTexto()
+        self.nombres_resueltos: set[str] = set()
+        self.efectos: list = None
+        self.tareas_cambiadas: set[int] = set()
+        self.colas_cambiadas: dict[int, Categoria] = {}
+        self.categorias_cambiadas: dict[int, tuple] = {}
+        self.instantanea_cada: int = None
+        self.secuencia_instantanea = 0
+
+    # Operaciones que modifican el estado y se anotan en el registro de escritura
+    OPERACIONES_REGISTRO = frozenset({
+        'agregarCategoria', 'agregarSubcategoria', 'agregarTarea', 'eliminarTarea', 'modificarTarea',
+        'agregarTareaUrgente', 'procesarTareaUrgente', 'procesarTareasUrgentes', 'retirarTareaUrgente',
+        'moverCategoria', 'aplicarEfectos',
+    })
+
+    @classmethod
+    def recuperar(cls, ruta: str, ruta_instantanea: str = None, sincronizar: str = 'grupo', tamano_grupo: int = 64,
+                  instantanea_cada: int = None, instantanea_binaria: bool = False, **opciones) -> 'ManejadorTareas':
+        """
+        Crea un manejador a partir de su última instantánea y del final de su registro de escritura,
+        y sigue anotando en ese registro.
+
+        El historial de deshacer no se guarda, así que el manejador recuperado empieza sin él.
+
+        Args:
+            ruta (str): Ruta del archivo de registro (se crea si no existe).
+            ruta_instantanea (str, optional): Ruta de la instantánea (sin instantáneas si es None).
+            sincronizar (str, optional): Política de sincronización del registro.
+            tamano_grupo (int, optional): Operaciones por grupo con la política 'grupo'.
+            instantanea_cada (int, optional): Guardar una instantánea cada este número de operaciones.
+            instantanea_binaria (bool, optional): Usar el formato binario para la instantánea.
+            **opciones: Argumentos para crear el ManejadorTareas.
+
+        Returns:
+            ManejadorTareas: El manejador con el estado recuperado.
+        """
+        manejador = cls(**opciones)
+        manejador.ruta_instantanea = ruta_instantanea
+        manejador.instantanea_cada = instantanea_cada
+        manejador.instantanea_binaria = instantanea_binaria
+        if ruta_instantanea is not None and os.path.exists(ruta_instantanea):
+            manejador.cargarInstantanea(ruta_instantanea)
+        secuencia = manejador.secuencia_instantanea
+        # Reproducir las operaciones posteriores a la instantánea sin mostrar sus mensajes
+        with open(os.devnull, 'w') as nulo, redirect_stdout(nulo):
+            for numero, operacion, argumentos in RegistroEscritura.leer(ruta):
+                if numero <= manejador.secuencia_instantanea:
+                    continue
+                secuencia = numero
+                if operacion in cls.OPERACIONES_REGISTRO:
+                    getattr(manejador, operacion)(*argumentos)
+        # Las acciones registradas al reproducir pueden haberse deshecho después con aplicarEfectos
+        manejador.vaciarHistorial()
+        manejador.registro = RegistroEscritura(ruta, sincronizar, tamano_grupo, secuencia)
+        return manejador
+
+    def guardarInstantanea(self, ruta: str = None):
+        """
+        Guarda el estado completo (categorías, tareas, colas urgentes y contadores) y vacía el registro.
+
+        El historial de deshacer se conserva: deshacer y rehacer se anotan en el
+        registro como los cambios que hacen, así que no dependen de él al recuperar.
+
+        Args:
+            ruta (str, optional): Archivo de la instantánea (por defecto, ruta_instantanea).
+        """
+        ruta = ruta or self.ruta_instantanea
+        if ruta is None:
+            print('Error: El manejador no tiene un archivo de instantánea asociado.')
+            return
+        if self.registro is not None:
+            self.registro.confirmar()
+        secuencia = self.registro.secuencia if self.registro is not None else 0
+        # La instantánea nueva reemplaza al archivo mapeado: terminar antes de leerlo
+        self.cargarPendientes()
+        # Escribir en un archivo temporal y reemplazar, para no dejar nunca una instantánea a medias
+        temporal = ruta + '.tmp'
+        if self.instantanea_binaria:
+            InstantaneaBinaria.escribir(self, temporal, secuencia)
+        else:
+            self.escribirInstantaneaJSON(temporal, secuencia)
+        os.replace(temporal, ruta)
+        self.secuencia_instantanea = secuencia
+        # Si el proceso cae antes de vaciar el registro, sus operaciones se saltan por su secuencia
+        if self.registro is not None:
+            self.registro.truncar()
+
+    def cargarPendientes(self):
+        """
+        Carga las tareas que aún solo están en la instantánea binaria abierta, si la hay.
+        """
+        if self.instantanea is not None:
+            self.instantanea.cargarPendientes()
+
+    def vaciarHistorial(self):
+        """
+        Vacía los historiales de deshacer y rehacer.
+        """
+        for historial in (self.historial_acciones, self.historial_deshacer):
+            with historial.mutex:
+                historial.queue.clear()
+        self.bytes_historial = 0
+        self.referencias_historial.clear()
+
+    def escribirInstantaneaJSON(self, ruta: str, secuencia: int):
+        """
+        Escribe el estado completo en formato JSON.
+
+        Args:
+            ruta (str): Archivo de destino.
+            secuencia (int): Última operación del registro incluida en la instantánea.
+        """
+        def exportar(categoria: Categoria) -> dict:
+            return {
+                'id': categoria.id,
+                'nombre': categoria.nombre,
+                'tareas': [[t.id, t.titulo, t.descripcion, t.prioridad, t.fecha_vencimiento] for t in categoria.tareas],
+                'urgentes': [[t.id, t.titulo, t.descripcion, t.prioridad, t.fecha_vencimiento]
+                             for t in categoria.tareasUrgentes.tareasEnOrden()],
+                'subcategorias': [exportar(subcategoria) for subcategoria in categoria.subcategorias],
+            }
+
+        estado = {
+            'secuencia': secuencia,
+            'idCategoria': self.idCategoria,
+            'idTarea': self.idTarea,
+            'categorias': [exportar(categoria) for categoria in self.categorias],
+        }
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(estado, archivo, ensure_ascii=False, default=RegistroEscritura.codificar)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+
+    def cargarInstantanea(self, ruta: str):
+        """
+        Carga en un manejador vacío el estado guardado por guardarInstantanea.
+
+        Args:
+            ruta (str): Archivo de la instantánea.
+        """
+        if self.instantanea_binaria:
+            # Las tareas se cargan por categorías desde el archivo a medida que se usan
+            InstantaneaBinaria(ruta).cargarEn(self)
+            return
+        with open(ruta, encoding='utf-8') as archivo:
+            estado = json.load(archivo, object_hook=RegistroEscritura.decodificar)
+
+        def importar(datos: dict, padre: Categoria = None):
+            categoria = Categoria(datos['id'], datos['nombre'], self.claseColaUrgente())
+            self.insertarCategoria(categoria, padre)
+            self.cargarTareas([Tareas(*fila) for fila in datos['tareas']], categoria)
+            for fila in datos['urgentes']:
+                categoria.tareasUrgentes.put(Tareas(*fila))
+            for subcategoria in datos['subcategorias']:
+                importar(subcategoria, categoria)
+
+        for datos in estado['categorias']:
+            importar(datos)
+        self.idCategoria = estado['idCategoria']
+        self.idTarea = estado['idTarea']
+        self.secuencia_instantanea = estado['secuencia']
+
+    @classmethod
+    def abrirAlmacen(cls, ruta: str, perezoso: bool = False, max_hidratadas: int = None, **opciones) -> 'ManejadorTareas':
+        """
+        Crea un manejador con el estado guardado en una base de datos SQLite.
+
+        Con carga perezosa solo se leen las categorías principales; las subcategorías
+        y las tareas de cada categoría se leen la primera vez que se usan.
+
+        Args:
+            ruta (str): Archivo de la base de datos (se crea si no existe).
+            perezoso (bool, optional): Cargar las categorías bajo demanda en lugar de todo al abrir.
+            max_hidratadas (int, optional): Con carga perezosa, máximo de categorías sin cambios con
+                tareas en memoria; las menos usadas se descargan (sin límite si es None).
+            **opciones: Argumentos para crear el ManejadorTareas.
+
+        Returns:
+            ManejadorTareas: El manejador asociado a la base de datos.
+        """
+        manejador = cls(**opciones)
+        almacen = AlmacenSQLite(ruta)
+        # El almacén se asocia después de cargar para que la carga no cuente como cambios
+        if not perezoso:
+            almacen.cargarEn(manejador)
+            manejador.almacen = almacen
+            return manejador
+        manejador.hidratadas = OrderedDict()
+        manejador.max_hidratadas = max_hidratadas
+        for id, nombre in almacen.subcategorias():
+            manejador.insertarCategoria(Categoria(id, nombre, cargador=manejador))
+        contadores = almacen.contadores()
+        manejador.idCategoria = contadores.get('idCategoria', manejador.idCategoria)
+        manejador.idTarea = contadores.get('idTarea', manejador.idTarea)
+        manejador.almacen = almacen
+        return manejador
+
+    def cargarSubcategorias(self, categoria: Categoria):
+        """
+        Carga desde el almacén las subcategorías directas de una categoría (sin sus tareas).
+
+        Args:
+            categoria (Categoria): Categoría cuyas subcategorías se cargan.
+        """
+        categoria.subcategorias = []
+        for id, nombre in self.almacen.subcategorias(categoria.id):
+            subcategoria = Categoria(id, nombre, cargador=self)
+            subcategoria.padre = categoria
+            categoria.subcategorias.append(subcategoria)
+            self.indexarCategoria(subcategoria)
+
+    def cargarContenido(self, categoria: Categoria):
+        """
+        Carga desde el almacén las tareas y tareas urgentes de una categoría,
+        descargando las categorías sin cambios menos usadas si se supera max_hidratadas.
+
+        Args:
+            categoria (Categoria): Categoría cuyas tareas se cargan.
+        """
+        tareas, urgentes = self.almacen.contenido(categoria.id)
+        categoria.tareas = []
+        categoria.tareas_ordenadas = []
+        categoria.tareasUrgentes = self.claseColaUrgente()
+        self.cargarTareas(tareas, categoria)
+        for tarea in urgentes:
+            categoria.tareasUrgentes.put(tarea)
+        self.hidratadas[categoria.id] = categoria
+        if self.max_hidratadas is None:
+            return
+        # Descargar las menos usadas, saltando las que tienen cambios en memoria
+        for id in list(self.hidratadas):
+            if len(self.hidratadas) <= self.max_hidratadas:
+                break
+            if id == categoria.id or id in self.categorias_fijadas or id in self.referencias_historial:
+                continue
+            descargada = self.hidratadas.pop(id)
+            for tarea in descargada.tareas:
+                del self.indice_tareas[tarea.id]
+                self.prefijos_tareas.quitar(tarea.titulo, tarea.id)
+                self.indice_texto.quitar(tarea.id)
+            descargada.descargarContenido()
+
+    def fijarCategoria(self, categoria: Categoria):
+        """
+        Marca una categoría con cambios sin guardar para que no se descargue.
+
+        Args:
+            categoria (Categoria): Categoría modificada.
+        """
+        if self.hidratadas is not None:
+            self.categorias_fijadas.add(categoria.id)
+
+    def referenciarCategoria(self, accion: Accion, cambio: int):
+        """
+        Cuenta una acción que entra (cambio=1) o sale (cambio=-1) de los historiales
+        entre las que usan su categoría.
+
+        Args:
+            accion (Accion): Acción del historial.
+            cambio (int): 1 al guardarla, -1 al descartarla.
+        """
+        if self.hidratadas is None:
+            return
+        id = accion.categoria.id
+        referencias = self.referencias_historial.get(id, 0) + cambio
+        if referencias:
+            self.referencias_historial[id] = referencias
+        else:
+            del self.referencias_historial[id]
+
+    def descartarAccion(self, accion: Accion):
+        """
+        Descuenta una acción que sale de los historiales sin volver a entrar.
+
+        Args:
+            accion (Accion): Acción descartada.
+        """
+        self.bytes_historial -= accion.tamano
+        self.referenciarCategoria(accion, -1)
+
+    def guardarAlmacen(self, completo: bool = False):
+        """
+        Guarda en la base de datos asociada los cambios hechos desde el último guardado.
+
+        Args:
+            completo (bool, optional): Reescribir todo el estado en lugar de solo los cambios.
+        """
+        if self.almacen is None:
+            print('Error: El manejador no tiene una base de datos asociada.')
+            return
+        if completo:
+            self.almacen.guardar(self)
+        else:
+            self.almacen.guardarCambios(self)
+        self.tareas_cambiadas.clear()
+        self.colas_cambiadas.clear()
+        self.categorias_cambiadas.clear()
+        # Las categorías guardadas ya se pueden descargar si ninguna acción del historial las usa
+        self.categorias_fijadas.clear()
+
+    def marcarTarea(self, tarea: Tareas, categoria: Categoria):
+        """Anota que una tarea de una categoría cambió y debe escribirse en el próximo guardado."""
+        if self.almacen is not None:
+            self.tareas_cambiadas.add(tarea.id)
+            self.fijarCategoria(categoria)
+
+    def marcarCola(self, categoria: Categoria):
+        """Anota que la cola urgente de una categoría cambió y debe escribirse en el próximo guardado."""
+        if self.almacen is not None:
+            self.colas_cambiadas[categoria.id] = categoria
+            self.fijarCategoria(categoria)
+
+    def marcarCategoria(self, categoria: Categoria, padre: Categoria = None):
+        """Anota que una categoría se agregó o retiró y debe escribirse en el próximo guardado."""
+        if self.almacen is not None:
+            self.categorias_cambiadas[categoria.id] = (categoria, padre)
+
+    def anotar(self, operacion: str, *argumentos):
+        """
+        Anota una operación realizada en el registro de escritura, si lo hay.
+
+        Args:
+            operacion (str): Nombre del método que modificó el estado.
+            *argumentos: Argumentos con los que se llamó.
+        """
+        if self.registro is not None:
+            self.registro.escribir(operacion, *argumentos)
+            # Compactar el registro con una instantánea cada cierto número de operaciones
+            if (self.instantanea_cada is not None and self.ruta_instantanea is not None
+                    and self.registro.secuencia - self.secuencia_instantanea >= self.instantanea_cada):
+                self.guardarInstantanea()
+
+    def registrarAccion(self, accion: Accion):
+        """
+        Guarda una acción en el historial, descartando las más antiguas si se superan los límites.
+
+        Args:
+            accion (Accion): Acción realizada.
+        """
+        accion.tamano = accion.estimarTamano()
+        # Con carga perezosa, la categoría de la acción se queda en memoria mientras la acción siga en el historial
+        self.referenciarCategoria(accion, 1)
+        self.historial_acciones.put(accion)
+        self.bytes_historial += accion.tamano
+        # Una acción nueva invalida las acciones deshechas pendientes de rehacer
+        with self.historial_deshacer.mutex:
+            for deshecha in self.historial_deshacer.queue:
+                self.descartarAccion(deshecha)
+            self.historial_deshacer.queue.clear()
+        # Descartar las acciones más antiguas (el fondo de la pila)
+        historial = self.historial_acciones
+        with historial.mutex:
+            while historial.queue and (
+                    (self.max_historial is not None and len(historial.queue) > self.max_historial)
+                    or (self.max_bytes_historial is not None and self.bytes_historial > self.max_bytes_historial)):
+                self.descartarAccion(historial.queue[0])
+                del historial.queue[0]
+                self.acciones_descartadas += 1
+
+    def metricasHistorial(self) -> dict:
+        """
+        Devuelve el estado de los historiales de deshacer y rehacer.
+
+        Returns:
+            dict: 'acciones' y 'deshechas' (entradas en cada pila), 'bytes' (tamaño
+                estimado de ambas) y 'descartadas' (acciones eliminadas por los límites).
+        """
+        return {
+            'acciones': self.historial_acciones.qsize(),
+            'deshechas': self.historial_deshacer.qsize(),
+            'bytes': self.bytes_historial,
+            'descartadas': self.acciones_descartadas,
+        }
+
+    def insertarCategoria(self, categoria: Categoria, padre: Categoria = None):
+        """
+        Inserta una categoría bajo su padre (o como principal) y la indexa.
+
+        Args:
+            categoria (Categoria): Categoría a insertar.
+            padre (Categoria, optional): Categoría padre, o None si es una categoría principal.
+        """
+        (padre.subcategorias if padre else self.categorias).append(categoria)
+        categoria.padre = padre
+        self.indexarCategoria(categoria)
+        self.marcarCategoria(categoria, padre)
+        self.anotarEfecto('insertarCategoria', categoria.id, categoria.nombre, padre.id if padre else None)
+
+    def retirarCategoria(self, categoria: Categoria, padre: Categoria = None):
+        """
+        Retira una categoría de su padre (o de las principales) y de los índices.
+
+        Args:
+            categoria (Categoria): Categoría a retirar.
+            padre (Categoria, optional): Categoría padre, o None si es una categoría principal.
+        """
+        hermanas = padre.subcategorias if padre else self.categorias
+        # Al deshacer, la categoría suele ser la última agregada
+        if hermanas and hermanas[-1] is categoria:
+            hermanas.pop()
+        else:
+            hermanas.remove(categoria)
+        del self.indice_categorias_id[categoria.id]
+        homonimas = self.indice_categorias_nombre[categoria.nombre]
+        homonimas.remove(categoria)
+        if not homonimas:
+            del self.indice_categorias_nombre[categoria.nombre]
+        self.desindexarRuta(categoria)
+        self.prefijos_categorias.quitar(categoria.nombre, categoria.id)
+        self.marcarCategoria(categoria, padre)
+        self.anotarEfecto('retirarCategoria', categoria.id)
+
+    def indexarCategoria(self, categoria: Categoria):
+        """
+        Registra una categoría en los índices de búsqueda por nombre e ID.
+
+        Args:
+            categoria (Categoria): Categoría a indexar.
+        """
+        self.indice_categorias_id[categoria.id] = categoria
+        # Un nombre puede repetirse en ramas distintas: se guardan todas en orden de ID
+        insort(self.indice_categorias_nombre.setdefault(categoria.nombre, []), categoria, key=ID_CATEGORIA)
+        self.indexarRuta(categoria)
+        self.prefijos_categorias.agregar(categoria.nombre, categoria.id)
+
+    def indexarRuta(self, categoria: Categoria):
+        """
+        Registra una categoría en el índice de rutas completas.
+
+        Args:
+            categoria (Categoria): Categoría a indexar.
+        """
+        ruta = categoria.ruta()
+        actual = self.indice_rutas.get(ruta)
+        if actual is None or categoria.id < actual.id:
+            self.indice_rutas[ruta] = categoria
+
+    def desindexarRuta(self, categoria: Categoria):
+        """
+        Quita una categoría del índice de rutas completas.
+
+        Args:
+            categoria (Categoria): Categoría a quitar.
+        """
+        ruta = categoria.ruta()
+        if self.indice_rutas.get(ruta) is categoria:
+            del self.indice_rutas[ruta]
+
+    def subarbol(self, categoria: Categoria):
+        """
+        Recorre una categoría y sus subcategorías en memoria (sin cargar las que no lo están).
+
+        Args:
+            categoria (Categoria): Raíz del subárbol.
+
+        Returns:
+            Iterator[Categoria]: Las categorías del subárbol, en profundidad.
+        """
+        pendientes = [categoria]
+        while pendientes:
+            categoria = pendientes.pop()
+            yield categoria
+            if categoria.cargado('subcategorias'):
+                pendientes.extend(reversed(categoria.subcategorias))
+
+    def reubicarCategoria(self, categoria: Categoria, padre: Categoria = None, posicion: int = None):
+        """
+        Mueve una categoría con todo su subárbol bajo otro padre (o a las principales)
+        y actualiza las rutas del subárbol.
+
+        Args:
+            categoria (Categoria): Categoría a mover.
+            padre (Categoria, optional): Nuevo padre, o None para convertirla en principal.
+            posicion (int, optional): Posición entre sus nuevas hermanas (al final si es None).
+        """
+        subarbol = list(self.subarbol(categoria))
+        for descendiente in subarbol:
+            self.desindexarRuta(descendiente)
+        (categoria.padre.subcategorias if categoria.padre else self.categorias).remove(categoria)
+        hermanas = padre.subcategorias if padre else self.categorias
+        hermanas.insert(len(hermanas) if posicion is None else posicion, categoria)
+        categoria.padre = padre
+        for descendiente in subarbol:
+            self.indexarRuta(descendiente)
+        self.marcarCategoria(categoria, padre)
+        self.anotarEfecto('reubicarCategoria', categoria.id, padre.id if padre else None, posicion)
+
+    def insertarTarea(self, tarea: Tareas, categoria: Categoria):
+        """
+        Inserta una tarea en una categoría y la registra en el índice de tareas.
+
+        Args:
+            tarea (Tareas): Tarea a insertar.
+            categoria (Categoria): Categoría que contendrá la tarea.
+        """
+        categoria.agregarTarea(tarea)
+        self.indice_tareas[tarea.id] = (tarea, categoria)
+        self.prefijos_tareas.agregar(tarea.titulo, tarea.id)
+        self.indice_texto.agregar(tarea.id, tarea.titulo, tarea.descripcion)
+        self.marcarTarea(tarea, categoria)
+        self.anotarEfecto('insertarTarea', self.datosTarea(tarea), categoria.id)
+
+    def cargarTareas(self, tareas: list, categoria: Categoria):
+        """
+        Inserta de una vez muchas tareas en una categoría, por ejemplo al cargar una instantánea.
+
+        Args:
+            tareas (list[Tareas]): Tareas ordenadas por ID.
+            categoria (Categoria): Categoría que contendrá las tareas.
+        """
+        categoria.cargarTareas(tareas)
+        for tarea in tareas:
+            self.indice_tareas[tarea.id] = (tarea, categoria)
+            self.indice_texto.agregar(tarea.id, tarea.titulo, tarea.descripcion)
+        # Con pocas tareas es más barato insertarlas una a una que reordenar todo el índice
+        if len(tareas) * 8 < len(self.prefijos_tareas):
+            for tarea in tareas:
+                self.prefijos_tareas.agregar(tarea.titulo, tarea.id)
+        else:
+            self.prefijos_tareas.agregarVarios((tarea.titulo, tarea.id) for tarea in tareas)
+
+    def retirarTarea(self, tarea: Tareas):
+        """
+        Retira una tarea de su categoría y del índice de tareas.
+
+        Args:
+            tarea (Tareas): Tarea a retirar.
+        """
+        _, categoria = self.indice_tareas.pop(tarea.id)
+        categoria.quitarTarea(tarea)
+        self.prefijos_tareas.quitar(tarea.titulo, tarea.id)
+        self.indice_texto.quitar(tarea.id)
+        self.marcarTarea(tarea, categoria)
+        self.anotarEfecto('retirarTarea', tarea.id)
+
+    def actualizarTarea(self, tarea: Tareas, categoria: Categoria, **campos):
+        """
+        Cambia campos de una tarea manteniendo el orden de su categoría.
+
+        Args:
+            tarea (Tareas): Tarea a actualizar.
+            categoria (Categoria): Categoría de la tarea.
+            **campos: Nuevos valores de los campos.
+        """
+        if 'titulo' in campos:
+            self.prefijos_tareas.quitar(tarea.titulo, tarea.id)
+            self.prefijos_tareas.agregar(campos['titulo'], tarea.id)
+        categoria.actualizarTarea(tarea, **campos)
+        if 'titulo' in campos or 'descripcion' in campos:
+            self.indice_texto.quitar(tarea.id)
+            self.indice_texto.agregar(tarea.id, tarea.titulo, tarea.descripcion)
+        self.marcarTarea(tarea, categoria)
+        self.anotarEfecto('actualizarTarea', tarea.id, campos)
+
+    def ponerUrgente(self, categoria: Categoria, tarea: Tareas):
+        """
+        Vuelve a poner en la cola urgente de una categoría una tarea que se había quitado.
+
+        Args:
+            categoria (Categoria): Categoría de la cola.
+            tarea (Tareas): Tarea urgente.
+        """
+        categoria.tareasUrgentes.put(tarea)
+        self.marcarCola(categoria)
+        self.anotarEfecto('ponerUrgente', categoria.id, self.datosTarea(tarea))
+
+    def retirarUrgente(self, categoria: Categoria, tarea: Tareas) -> bool:
+        """
+        Quita una tarea concreta de la cola urgente de una categoría.
 
-    def __str__(self):
-        """Representación en string de la tarea."""
-        return f'{self.titulo} - {self.descripcion} - Prioridad: {self.prioridad} - Vencimiento: {self.fecha_vencimiento.strftime("%d/%m/%Y")}'
+        Args:
+            categoria (Categoria): Categoría de la cola.
+            tarea (Tareas): Tarea urgente.
 
+        Returns:
+            bool: False si la tarea ya no estaba en la cola.
+        """
+        if not categoria.tareasUrgentes.retirar(tarea):
+            return False
+        self.marcarCola(categoria)
+        self.anotarEfecto('retirarUrgente', categoria.id, tarea.id)
+        return True
 
-class Categoria:
-    """
-    Clase que representa una categoría que puede contener subcategorías y tareas.
+    def devolverUrgente(self, categoria: Categoria, tarea: Tareas):
+        """
+        Devuelve al frente de la cola urgente de una categoría una tarea ya procesada.
 
-    Atributos:
-        id (int): Identificador único de la categoría.
-        nombre (str): Nombre de la categoría.
-        subcategorias (list[Categoria]): Lista de subcategorías de esta categoría.
-        tareasUrgentes (Queue[Tareas]): Cola de tareas urgentes de esta categoría.
-        tareas (list[Tareas]): Lista de tareas asociadas a esta categoría.
-    """
-    def __init__(self, id: int, nombre: str):
-        self.id = id
-        self.nombre = nombre
-        self.subcategorias: list[Categoria] = []
-        self.tareasUrgentes: Queue[Tareas] = Queue()
-        self.tareas: list[Tareas] = []
+        Args:
+            categoria (Categoria): Categoría de la cola.
+            tarea (Tareas): Tarea urgente.
+        """
+        categoria.tareasUrgentes.devolver(tarea)
+        self.marcarCola(categoria)
+        self.anotarEfecto('devolverUrgente', categoria.id, self.datosTarea(tarea))
 
-    def __str__(self):
-        """Representación en string de la categoría."""
-        return f'{self.nombre}'
+    @staticmethod
+    def datosTarea(tarea: Tareas) -> list:
+        """Campos de una tarea en el orden del constructor de Tareas, para anotarla en el registro."""
+        return [tarea.id, tarea.titulo, tarea.descripcion, tarea.prioridad, tarea.fecha_vencimiento]
 
-    def agregarSubcategoria(self, id: int, nombre: str):
+    def anotarEfecto(self, operacion: str, *argumentos):
         """
-        Agrega una nueva subcategoría a la categoría actual.
-        
+        Guarda un cambio hecho al deshacer o rehacer, si se están capturando (ver capturarEfectos).
+
         Args:
-            id (int): Identificador de la nueva subcategoría.
-            nombre (str): Nombre de la nueva subcategoría.
+            operacion (str): Operación de aplicarEfectos que repite el cambio.
+            *argumentos: Argumentos de la operación (IDs y valores, sin objetos).
         """
-        categoria = Categoria(id, nombre)
-        self.subcategorias.append(categoria)
+        if self.efectos is not None:
+            self.efectos.append([operacion, *argumentos])
 
+    def capturarEfectos(self, funcion, *argumentos):
+        """
+        Ejecuta una función de historial anotando en el registro los cambios que hace,
+        de modo que al recuperar se repitan sin necesitar el historial.
 
-class ManejadorTareas:
-    """
-    Clase que administra categorías, subcategorías, tareas y permite la gestión de un historial de acciones.
+        Args:
+            funcion (Callable): Función que deshace o rehace acciones.
+            *argumentos: Argumentos de la función.
+
+        Returns:
+            El valor que devuelve la función.
+        """
+        self.efectos = []
+        resultado = funcion(*argumentos)
+        efectos, self.efectos = self.efectos, None
+        if efectos:
+            self.anotar('aplicarEfectos', efectos)
+        return resultado
+
+    def aplicarEfectos(self, efectos: list):
+        """
+        Repite cambios anotados por capturarEfectos, sin tocar el historial.
+
+        Args:
+            efectos (list[list]): Cambios en el orden en que se hicieron.
+        """
+        categorias = self.indice_categorias_id
+        for operacion, *argumentos in efectos:
+            if operacion == 'insertarTarea':
+                datos, idCategoria = argumentos
+                self.insertarTarea(Tareas(*datos), categorias[idCategoria])
+            elif operacion == 'retirarTarea':
+                self.retirarTarea(self.encontrarTarea(argumentos[0])[0])
+            elif operacion == 'actualizarTarea':
+                tarea, categoria = self.encontrarTarea(argumentos[0])
+                self.actualizarTarea(tarea, categoria, **argumentos[1])
+            elif operacion == 'insertarCategoria':
+                id, nombre, idPadre = argumentos
+                padre = categorias[idPadre] if idPadre is not None else None
+                self.insertarCategoria(Categoria(id, nombre, self.claseColaUrgente()), padre)
+            elif operacion == 'retirarCategoria':
+                categoria = categorias[argumentos[0]]
+                self.retirarCategoria(categoria, categoria.padre)
+            elif operacion == 'reubicarCategoria':
+                id, idPadre, posicion = argumentos
+                self.reubicarCategoria(categorias[id], categorias[idPadre] if idPadre is not None else None, posicion)
+            elif operacion == 'ponerUrgente':
+                idCategoria, datos = argumentos
+                self.ponerUrgente(categorias[idCategoria], Tareas(*datos))
+            elif operacion == 'devolverUrgente':
+                idCategoria, datos = argumentos
+                self.devolverUrgente(categorias[idCategoria], Tareas(*datos))
+            elif operacion == 'retirarUrgente':
+                idCategoria, idTarea = argumentos
+                categoria = categorias[idCategoria]
+                tarea = next(tarea for tarea in categoria.tareasUrgentes.tareasEnOrden() if tarea.id == idTarea)
+                self.retirarUrgente(categoria, tarea)
+
+    def autocompletarCategorias(self, prefijo: str, limite: int = 10) -> list[str]:
+        """
+        Devuelve nombres de categorías que empiezan por un prefijo (sin distinguir mayúsculas).
+
+        Con carga perezosa, las categorías que aún no están en memoria se buscan en el
+        índice de nombres del almacén, que solo iguala mayúsculas y minúsculas ASCII.
+
+        Args:
+            prefijo (str): Comienzo del nombre.
+            limite (int, optional): Número máximo de nombres.
+
+        Returns:
+            list[str]: Nombres distintos en orden alfabético.
+        """
+        nombres = self.prefijos_categorias.completar(prefijo, limite)
+        if self.hidratadas is None:
+            return nombres
+        clave = IndicePrefijos.clave(prefijo)
+        guardados = set()
+        for id, nombre in self.almacen.categoriasConPrefijo(prefijo):
+            if len(guardados) >= limite:
+                break
+            # Saltar las categorías retiradas en memoria que aún siguen en el almacén
+            if id in self.categorias_cambiadas and id not in self.indice_categorias_id:
+                continue
+            if IndicePrefijos.clave(nombre).startswith(clave):
+                guardados.add(nombre)
+        # Mezclar con los nombres en memoria en el mismo orden que el índice de prefijos
+        nombres = sorted(guardados.union(nombres), key=lambda nombre: (IndicePrefijos.clave(nombre), nombre))
+        return nombres[:limite]
+
+    def tareasSinCargar(self, idCategoria: int) -> bool:
+        """
+        Indica si las tareas guardadas de una categoría no están en memoria (con carga perezosa),
+        es decir, si el almacén es la única fuente de sus tareas.
+
+        Args:
+            idCategoria (int): ID de la categoría en el almacén.
+        """
+        categoria = self.indice_categorias_id.get(idCategoria)
+        if categoria is None:
+            # Una categoría retirada en memoria que aún sigue en el almacén ya no tiene tareas
+            return idCategoria not in self.categorias_cambiadas
+        return not categoria.cargado('tareas')
+
+    def autocompletarTareas(self, prefijo: str, limite: int = 10) -> list[str]:
+        """
+        Devuelve títulos de tareas que empiezan por un prefijo (sin distinguir mayúsculas).
+
+        Con carga perezosa, los títulos de las categorías sin cargar se buscan en el
+        índice de títulos del almacén, que solo iguala mayúsculas y minúsculas ASCII.
+
+        Args:
+            prefijo (str): Comienzo del título.
+            limite (int, optional): Número máximo de títulos.
+
+        Returns:
+            list[str]: Títulos distintos en orden alfabético.
+        """
+        # Los títulos de las categorías sin cargar de una instantánea binaria aún no están en el índice
+        self.cargarPendientes()
+        titulos = self.prefijos_tareas.completar(prefijo, limite)
+        if self.hidratadas is None:
+            return titulos
+        clave = IndicePrefijos.clave(prefijo)
+        guardados = set()
+        for idCategoria, titulo in self.almacen.titulosConPrefijo(prefijo):
+            if len(guardados) >= limite:
+                break
+            # Las tareas de las categorías cargadas ya están en el índice, quizá con cambios sin guardar
+            if self.tareasSinCargar(idCategoria) and IndicePrefijos.clave(titulo).startswith(clave):
+                guardados.add(titulo)
+        titulos = sorted(guardados.union(titulos), key=lambda titulo: (IndicePrefijos.clave(titulo), titulo))
+        return titulos[:limite]
+
+    def encontrarTarea(self, idTarea: int, categoria_nombre: str = None) -> tuple[Tareas, Categoria]:
+        """
+        Encuentra una tarea por ID usando el índice de tareas.
+
+        Args:
+            idTarea (int): ID de la tarea.
+            categoria_nombre (str, optional): Nombre de la categoría donde debe estar la tarea.
+
+        Returns:
+            tuple[Tareas, Categoria]: La tarea y su categoría, o (None, None) si no se encuentra.
+        """
+        tarea, categoria = self.indice_tareas.get(idTarea, (None, None))
+        # Con carga perezosa, la tarea puede estar en una categoría aún no cargada
+        if tarea is None and self.hidratadas is not None:
+            fila = self.almacen.buscarTarea(idTarea)
+            guardada = fila and self.encontrarCategoria(id=fila[1])
+            if guardada and not guardada.cargado('tareas'):
+                guardada.tareas
+                tarea, categoria = self.indice_tareas.get(idTarea, (None, None))
+        elif tarea is None and self.instantanea is not None:
+            guardada = self.indice_categorias_id.get(self.instantanea.categoriaDeTarea(idTarea))
+            if guardada and not guardada.cargado('tareas'):
+                guardada.tareas
+                tarea, categoria = self.indice_tareas.get(idTarea, (None, None))
+        # Si se indicó una categoría, la tarea debe pertenecer a ella
+        if categoria_nombre is not None and categoria is not self.encontrarCategoria(nombre=categoria_nombre):
+            return None, None
+        return tarea, categoria
 
-    Atributos:
-        categorias (list[Categoria]): Lista de todas las categorías.
-        idCategoria (int): Contador para el ID de la próxima categoría.
-        idTarea (int): Contador para el ID de la próxima tarea.
-        historial_acciones (list): Historial de acciones realizadas.
-        historial_deshacer (list): Historial de acciones para deshacer.
-    """
-    def __init__(self) -> None:
-        self.categorias: list[Categoria] = []
-        self.idCategoria = 1
-        self.idTarea = 1
-        self.historial_acciones = LifoQueue()
-        self.historial_deshacer = LifoQueue()
-  
     def encontrarCategoria(self, id: int = None, nombre: str = None) -> Categoria:
         """
-        Encuentra una categoría por ID o nombre.
+        Encuentra una categoría por ID, nombre o ruta.
+
+        Un nombre con SEPARADOR_RUTA se busca como ruta completa ('Trabajo/Proyecto'
+        o '/Trabajo' para una categoría principal). Un nombre simple es el de una
+        categoría principal si la hay; si no, solo se encuentra si no se repite en
+        varias ramas (errorCategoria explica el caso ambiguo).
 
         Args:
             id (int, optional): ID de la categoría.
-            nombre (str, optional): Nombre de la categoría.
+            nombre (str, optional): Nombre o ruta de la categoría.
 
         Returns:
-            Categoria: La categoría encontrada, o None si no se encuentra.
+            Categoria: La categoría encontrada, o None si no se encuentra o el nombre es ambiguo.
         """
-        # Buscar en las categorías principales
-        for categoria in self.categorias:
-            # Si se encuentra la categoría, retornarla
-            if categoria.id == id or categoria.nombre == nombre:
-                return categoria
-            # Buscar en las subcategorías
-            for subcategoria in categoria.subcategorias:
-                resultado = self.encontrarCategoriaEnSubcategorias(subcategoria, id, nombre)
-                if resultado:
-                    return resultado
-        return None
+        categoria = None
+        # Buscar primero por ID y después por nombre o ruta
+        if id is not None:
+            categoria = self.indice_categorias_id.get(id)
+            if categoria is None and self.hidratadas is not None:
+                categoria = self.encontrarCategoriaGuardada(id)
+        if categoria is None and nombre is not None:
+            categoria = self.encontrarCategoriaPorRuta(nombre)
+            if categoria is None and SEPARADOR_RUTA not in nombre:
+                homonimas = self.categoriasConNombre(nombre)
+                categoria = homonimas[0] if len(homonimas) == 1 else None
+        # Marcar la categoría como la más recientemente usada
+        if self.hidratadas is not None and categoria is not None and categoria.id in self.hidratadas:
+            self.hidratadas.move_to_end(categoria.id)
+        return categoria
 
-    def encontrarCategoriaEnSubcategorias(self, categoria: Categoria, id: int = None, nombre: str = None) -> Categoria:
+    def categoriasConNombre(self, nombre: str) -> list[Categoria]:
         """
-        Busca una categoría en las subcategorías recursivamente.
+        Devuelve todas las categorías con un nombre, en orden de ID.
+
+        Con carga perezosa, la primera vez que se pide un nombre se cargan desde el
+        almacén las ramas de todas las categorías que lo usan.
 
         Args:
-            categoria (Categoria): Categoría inicial donde empezar la búsqueda.
-            id (int, optional): ID de la categoría.
-            nombre (str, optional): Nombre de la categoría.
+            nombre (str): Nombre de la categoría (sin ruta).
 
         Returns:
-            Categoria: La categoría encontrada, o None si no se encuentra.
+            list[Categoria]: Las categorías encontradas.
+        """
+        if self.hidratadas is not None and nombre not in self.nombres_resueltos:
+            for id in self.almacen.idsCategorias(nombre):
+                self.encontrarCategoriaGuardada(id)
+            self.nombres_resueltos.add(nombre)
+        return self.indice_categorias_nombre.get(nombre, [])
+
+    def errorCategoria(self, nombre: str):
+        """
+        Muestra por qué no se encontró una categoría: no existe o su nombre se repite en varias ramas.
+
+        Args:
+            nombre (str): Nombre o ruta buscado.
+        """
+        homonimas = self.categoriasConNombre(nombre) if nombre and SEPARADOR_RUTA not in nombre else []
+        if len(homonimas) > 1:
+            rutas = ', '.join(categoria.ruta() for categoria in homonimas)
+            print(f"Error: Hay varias categorías llamadas '{nombre}' ({rutas}); indica su ruta.")
+        else:
+            print('Error: La categoría no existe.')
+
+    def encontrarCategoriaPorRuta(self, ruta: str) -> Categoria:
+        """
+        Encuentra una categoría por su ruta completa ('Trabajo/Proyecto/Backend').
+
+        Args:
+            ruta (str): Nombres de la categoría y sus ancestros separados por SEPARADOR_RUTA
+                (se admite un separador inicial).
+
+        Returns:
+            Categoria: La categoría encontrada, o None si no existe.
         """
-        # Si se encuentra la categoría, retornarla
-        if categoria.id == id or categoria.nombre == nombre:
+        ruta = ruta.lstrip(SEPARADOR_RUTA)
+        categoria = self.indice_rutas.get(ruta)
+        if categoria is not None or self.hidratadas is None:
             return categoria
-        # Buscar en las subcategorías
-        for subcategoria in categoria.subcategorias:
-            resultado = self.encontrarCategoriaEnSubcategorias(subcategoria, id, nombre)
-            if resultado:
-                return resultado
-        return None
+        # Con carga perezosa, bajar por la ruta cargando solo las subcategorías de cada nivel
+        hermanas = self.categorias
+        for nombre in ruta.split(SEPARADOR_RUTA):
+            categoria = next((hermana for hermana in hermanas if hermana.nombre == nombre), None)
+            if categoria is None:
+                return None
+            hermanas = categoria.subcategorias
+        return categoria
+
+    def existeHermana(self, nombre: str, padre: Categoria = None) -> bool:
+        """
+        Comprueba si una categoría ya tiene una subcategoría (o si hay una principal) con ese nombre.
+
+        Args:
+            nombre (str): Nombre a comprobar.
+            padre (Categoria, optional): Categoría padre, o None para las categorías principales.
+
+        Returns:
+            bool: True si el nombre ya está usado entre las hermanas.
+        """
+        ruta = nombre if padre is None else padre.ruta() + SEPARADOR_RUTA + nombre
+        return self.encontrarCategoriaPorRuta(ruta) is not None
+
+    def encontrarCategoriaGuardada(self, id: int) -> Categoria:
+        """
+        Encuentra una categoría por ID con carga perezosa, cargando desde el
+        almacén la rama que lleva hasta ella si aún no está en memoria.
+
+        Args:
+            id (int): ID de la categoría.
+
+        Returns:
+            Categoria: La categoría encontrada, o None si no se encuentra.
+        """
+        if id in self.indice_categorias_id:
+            return self.indice_categorias_id[id]
+        fila = self.almacen.buscarCategoria(id)
+        if fila is None:
+            return None
+        # Cargar los hermanos de la categoría desde su padre
+        padre = self.encontrarCategoriaGuardada(fila[2]) if fila[2] is not None else None
+        if padre is not None and not padre.cargado('subcategorias'):
+            padre.subcategorias
+        return self.indice_categorias_id.get(id)
 
     def agregarCategoria(self, nombre: str):
         """
@@ -129,17 +2616,21 @@ class ManejadorTareas:
         Args:
             nombre (str): Nombre de la nueva categoría.
         """
-        # Verificar si la categoría ya existe
-        categoria = self.encontrarCategoria(nombre=nombre)
-        if categoria:
+        if SEPARADOR_RUTA in nombre:
+            print(f"Error: El nombre no puede contener '{SEPARADOR_RUTA}'.")
+        # Verificar si ya existe una categoría principal con ese nombre
+        elif self.existeHermana(nombre):
             print('Error: La categoría ya existe.')
         else:
             # Agregar la nueva categoría
-            self.categorias.append(Categoria(self.idCategoria, nombre))
+            categoria = Categoria(self.idCategoria, nombre, self.claseColaUrgente())
+            self.insertarCategoria(categoria)
+            self.registrarAccion(AccionAgregarCategoria(categoria))
             # Incrementar el contador de categorías
             self.idCategoria += 1
             # Mostrar mensaje de éxito
-            print(f"Categoría '{nombre}' agregada correctamente.")
+            self.anotar('agregarCategoria', nombre)
+            print(f"Categoría '{categoria.ruta()}' agregada correctamente.")
 
     def agregarSubcategoria(self, nombre: str, nombreCategoria: str):
         """
@@ -147,20 +2638,59 @@ class ManejadorTareas:
 
         Args:
             nombre (str): Nombre de la subcategoría.
-            nombreCategoria (str): Nombre de la categoría padre.
+            nombreCategoria (str): Nombre o ruta de la categoría padre.
         """
+        if SEPARADOR_RUTA in nombre:
+            print(f"Error: El nombre no puede contener '{SEPARADOR_RUTA}'.")
+            return
         # Encontrar la categoría padre
         categoria = self.encontrarCategoria(nombre=nombreCategoria)
-        if categoria:
+        # Dos subcategorías de la misma categoría no pueden llamarse igual
+        if categoria and self.existeHermana(nombre, categoria):
+            print('Error: La subcategoría ya existe.')
+        elif categoria:
             # Agregar la subcategoría
-            categoria.agregarSubcategoria(self.idCategoria, nombre)
+            # La cola se crea desde el manejador para no cargar las tareas del padre con carga perezosa
+            subcategoria = categoria.agregarSubcategoria(self.idCategoria, nombre, self.claseColaUrgente())
+            self.indexarCategoria(subcategoria)
+            self.marcarCategoria(subcategoria, categoria)
+            self.registrarAccion(AccionAgregarCategoria(subcategoria, categoria))
             # Incrementar el contador de categorías
             self.idCategoria += 1
             # Mostrar mensaje de éxito
-            print(f"Subcategoría '{nombre}' agregada a '{nombreCategoria}'.")
+            self.anotar('agregarSubcategoria', nombre, nombreCategoria)
+            print(f"Subcategoría '{nombre}' agregada a '{categoria.ruta()}'.")
         else:
-            # Mostrar mensaje de error si la categoría padre no existe
-            print('Error: La categoría no existe.')
+            # Mostrar mensaje de error si la categoría padre no existe o es ambigua
+            self.errorCategoria(nombreCategoria)
+
+    def moverCategoria(self, nombre: str, nombrePadre: str = None):
+        """
+        Mueve una categoría con todas sus subcategorías y tareas bajo otra categoría.
+
+        Args:
+            nombre (str): Nombre o ruta de la categoría a mover.
+            nombrePadre (str, optional): Nombre o ruta del nuevo padre, o None para convertirla en categoría principal.
+        """
+        # Encontrar la categoría y su nuevo padre
+        categoria = self.encontrarCategoria(nombre=nombre)
+        padre = self.encontrarCategoria(nombre=nombrePadre) if nombrePadre is not None else None
+        if not categoria or (nombrePadre is not None and not padre):
+            self.errorCategoria(nombre if not categoria else nombrePadre)
+            return
+        # El nuevo padre no puede estar dentro del subárbol que se mueve
+        if padre is categoria or (padre is not None and categoria in padre.ancestros()):
+            print('Error: Una categoría no puede moverse dentro de sí misma.')
+            return
+        if categoria.padre is not padre and self.existeHermana(categoria.nombre, padre):
+            print('Error: Ya existe una categoría con ese nombre en el destino.')
+            return
+        anterior = categoria.padre
+        posicion = (anterior.subcategorias if anterior else self.categorias).index(categoria)
+        self.reubicarCategoria(categoria, padre)
+        self.registrarAccion(AccionMoverCategoria(categoria, anterior, posicion, padre))
+        self.anotar('moverCategoria', nombre, nombrePadre)
+        print(f"Categoría '{nombre}' movida a '{categoria.ruta()}'.")
 
     def mostrarCategorias(self):
         """
@@ -228,44 +2758,45 @@ class ManejadorTareas:
         if categoria:
             # Crear la tarea y agregarla a la categoría
             tarea = Tareas(self.idTarea, titulo, descripcion, prioridad, fecha_vencimiento)
-            categoria.tareas.append(tarea)
+            self.insertarTarea(tarea, categoria)
             # Incrementar el contador de tareas
             self.idTarea += 1
             # Agregar la acción al historial
-            self.historial_acciones.put(('agregar', tarea, categoria))
-            print(f"Tarea '{titulo}' agregada correctamente a la categoría '{categoria_nombre}'.")
+            self.registrarAccion(AccionAgregarTarea(tarea, categoria))
+            self.anotar('agregarTarea', titulo, descripcion, prioridad, fecha_vencimiento, categoria_nombre)
+            print(f"Tarea '{titulo}' agregada correctamente a la categoría '{categoria.ruta()}'.")
         else:
-            # Mostrar mensaje de error si la categoría no existe
-            print('Error: La categoría no existe.')
+            # Mostrar mensaje de error si la categoría no existe o es ambigua
+            self.errorCategoria(categoria_nombre)
 
-    def eliminarTarea(self, idTarea: int, categoria_nombre: str):
+    def eliminarTarea(self, idTarea: int, categoria_nombre: str = None):
         """
-        Elimina una tarea de una categoría específica.
+        Elimina una tarea por ID, opcionalmente comprobando su categoría.
 
         Args:
             idTarea (int): ID de la tarea a eliminar.
-            categoria_nombre (str): Nombre de la categoría donde está la tarea.
+            categoria_nombre (str, optional): Nombre de la categoría donde está la tarea.
         """
-        # Encontrar la categoría
-        categoria = self.encontrarCategoria(nombre=categoria_nombre)
-        if categoria:
+        # Encontrar la categoría si se indicó
+        if categoria_nombre is None or self.encontrarCategoria(nombre=categoria_nombre):
             # Encontrar la tarea
-            tarea = next((tarea for tarea in categoria.tareas if tarea.id == idTarea), None)
+            tarea, categoria = self.encontrarTarea(idTarea, categoria_nombre)
             if tarea:
                 # Eliminar la tarea
-                categoria.tareas.remove(tarea)
+                self.retirarTarea(tarea)
                 # Agregar la acción al historial
-                self.historial_acciones.put(('eliminar', tarea, categoria))
+                self.registrarAccion(AccionEliminarTarea(tarea, categoria))
                 # Mostrar mensaje de éxito
+                self.anotar('eliminarTarea', idTarea, categoria_nombre)
                 print(f"Tarea con ID '{idTarea}' eliminada correctamente.")
             else:
                 print('Error: La tarea no existe.')
         else:
-            print('Error: La categoría no existe.')
+            self.errorCategoria(categoria_nombre)
 
-    def modificarTarea(self, idTarea: int, nuevo_titulo: str, nueva_descripcion: str, nueva_prioridad: int, nueva_fecha_vencimiento: datetime, categoria_nombre: str):
+    def modificarTarea(self, idTarea: int, nuevo_titulo: str, nueva_descripcion: str, nueva_prioridad: int, nueva_fecha_vencimiento: datetime, categoria_nombre: str = None):
         """
-        Modifica una tarea existente.
+        Modifica una tarea existente por ID, opcionalmente comprobando su categoría.
 
         Args:
             idTarea (int): ID de la tarea a modificar.
@@ -273,28 +2804,98 @@ class ManejadorTareas:
             nueva_descripcion (str): Nueva descripción de la tarea.
             nueva_prioridad (int): Nueva prioridad de la tarea (1 alta, 3 baja).
             nueva_fecha_vencimiento (datetime): Nueva fecha de vencimiento de la tarea.
-            categoria_nombre (str): Nombre de la categoría donde está la tarea.
+            categoria_nombre (str, optional): Nombre de la categoría donde está la tarea.
         """
-        # Encontrar la categoría
-        categoria = self.encontrarCategoria(nombre=categoria_nombre)
-        if categoria:
+        # Encontrar la categoría si se indicó
+        if categoria_nombre is None or self.encontrarCategoria(nombre=categoria_nombre):
             # Encontrar la tarea
-            tarea = next((tarea for tarea in categoria.tareas if tarea.id == idTarea), None)
+            tarea, categoria = self.encontrarTarea(idTarea, categoria_nombre)
             # Si la tarea existe, modificarla
             if tarea:
-                tarea_anterior = Tareas(tarea.id, tarea.titulo, tarea.descripcion, tarea.prioridad, tarea.fecha_vencimiento)
-                tarea.titulo = nuevo_titulo
-                tarea.descripcion = nueva_descripcion
-                tarea.prioridad = nueva_prioridad
-                tarea.fecha_vencimiento = nueva_fecha_vencimiento
-                # Agregar la acción al historial
-                self.historial_acciones.put(('modificar', tarea_anterior, tarea, categoria))
+                # Guardar solo los campos que cambian, con su valor anterior y el nuevo
+                nuevos = {'titulo': nuevo_titulo, 'descripcion': nueva_descripcion,
+                          'prioridad': nueva_prioridad, 'fecha_vencimiento': nueva_fecha_vencimiento}
+                cambios = {campo: (getattr(tarea, campo), valor) for campo, valor in nuevos.items()
+                           if getattr(tarea, campo) != valor}
+                if cambios:
+                    self.actualizarTarea(tarea, categoria, **{campo: nuevo for campo, (_, nuevo) in cambios.items()})
+                    # Agregar la acción al historial
+                    self.registrarAccion(AccionModificarTarea(tarea, categoria, cambios))
+                    self.anotar('modificarTarea', idTarea, nuevo_titulo, nueva_descripcion, nueva_prioridad,
+                                nueva_fecha_vencimiento, categoria_nombre)
                 # Mostrar mensaje de éxito
                 print(f"Tarea '{nuevo_titulo}' modificada correctamente.")
             else:
                 print('Error: La tarea no existe.')
         else:
-            print('Error: La categoría no existe.')
+            self.errorCategoria(categoria_nombre)
+
+    def buscarTareas(self, consulta: str, limite: int = 10) -> list[tuple]:
+        """
+        Busca tareas por las palabras de su título y descripción, de la más a la menos relevante.
+
+        Args:
+            consulta (str): Palabras a buscar; admite "frases", -exclusiones y OR (ver IndiceTexto.buscar).
+            limite (int, optional): Número máximo de resultados.
+
+        Returns:
+            list[tuple[Tareas, Categoria, float]]: Cada tarea encontrada con su categoría y su puntuación.
+        """
+        self.cargarPendientes()
+        if self.hidratadas is None:
+            encontradas = self.indice_texto.buscar(consulta, limite)
+        else:
+            encontradas = self.buscarTareasGuardadas(consulta, limite)
+        resultados = []
+        for id, puntuacion in encontradas:
+            # Con carga perezosa, esto carga las categorías de las tareas encontradas en el almacén
+            tarea, categoria = self.encontrarTarea(id)
+            resultados.append((tarea, categoria, puntuacion))
+        return resultados
+
+    def buscarTareasGuardadas(self, consulta: str, limite: int = 10) -> list[tuple[int, float]]:
+        """
+        Busca como IndiceTexto.buscar entre las tareas en memoria y las de las categorías sin cargar.
+
+        Las tareas guardadas con alguna palabra buscada (según tareas_palabras) se indexan
+        solo mientras dura la búsqueda, y el idf cuenta todas las tareas guardadas, así que
+        el resultado es el mismo que con todas las categorías cargadas.
+
+        Args:
+            consulta (str): Texto de la consulta.
+            limite (int, optional): Número máximo de resultados.
+
+        Returns:
+            list[tuple[int, float]]: (ID de tarea, puntuación), de la más a la menos relevante.
+        """
+        palabras = {palabra for grupo in IndiceTexto.analizar(consulta)
+                    for negada, frase in grupo if not negada for palabra in frase}
+        candidatas = [(id, titulo, descripcion)
+                      for id, idCategoria, titulo, descripcion in self.almacen.textosConPalabras(palabras)
+                      if self.tareasSinCargar(idCategoria)]
+        total = len(self.indice_texto) + sum(cantidad for idCategoria, cantidad in self.almacen.contarTareas().items()
+                                             if self.tareasSinCargar(idCategoria))
+        try:
+            for id, titulo, descripcion in candidatas:
+                self.indice_texto.agregar(id, titulo, descripcion)
+            return self.indice_texto.buscar(consulta, limite, total)
+        finally:
+            for id, _, _ in candidatas:
+                self.indice_texto.quitar(id)
+
+    def mostrarBusqueda(self, consulta: str, limite: int = 10):
+        """
+        Muestra las tareas que coinciden con una búsqueda, con la ruta de su categoría.
+
+        Args:
+            consulta (str): Palabras a buscar.
+            limite (int, optional): Número máximo de resultados.
+        """
+        resultados = self.buscarTareas(consulta, limite)
+        if not resultados:
+            print('No se encontraron tareas.')
+        for tarea, categoria, _ in resultados:
+            print(f'[{tarea.id}] {tarea} ({categoria.ruta()})')
 
     def mostrarTareasOrdenadas(self, categoria_nombre: str):
         """
@@ -306,40 +2907,57 @@ class ManejadorTareas:
         # Encontrar la categoría
         categoria = self.encontrarCategoria(nombre=categoria_nombre)
         if categoria:
-            # Ordenar las tareas por prioridad y fecha de vencimiento
+            # Las tareas ya se mantienen ordenadas por prioridad y fecha de vencimiento
             if categoria.tareas:
-                tareas_ordenadas = sorted(categoria.tareas, key=lambda t: (t.prioridad, t.fecha_vencimiento))
-                for tarea in tareas_ordenadas:
+                for tarea in categoria.tareas_ordenadas:
                     print(tarea)
             else:
                 print("No hay tareas en esta categoría.")
         else:
-            print('Error: La categoría no existe.')
+            self.errorCategoria(categoria_nombre)
+
+    def tareasOrdenadas(self, categoria_nombre: str, limite: int = None, desplazamiento: int = 0, cursor: tuple = None) -> list[Tareas]:
+        """
+        Devuelve una página de tareas de una categoría ordenadas por prioridad y fecha de vencimiento.
+
+        El coste depende solo del tamaño de la página, porque las tareas ya están ordenadas.
+
+        Args:
+            categoria_nombre (str): Nombre de la categoría.
+            limite (int, optional): Número máximo de tareas a devolver (todas si es None).
+            desplazamiento (int, optional): Tareas a saltar desde el inicio o desde el cursor.
+            cursor (tuple, optional): claveOrden() de la última tarea de la página anterior.
+
+        Returns:
+            list[Tareas]: Las tareas de la página, o None si la categoría no existe.
+        """
+        # Encontrar la categoría
+        categoria = self.encontrarCategoria(nombre=categoria_nombre)
+        if not categoria:
+            return None
+        # Si las tareas no están en memoria, la página sale del índice del almacén sin cargarlas
+        if cursor is None and categoria.cargador is self and not categoria.cargado('tareas'):
+            return self.almacen.tareasOrdenadas(categoria.id, limite, desplazamiento)
+        # Empezar justo después del cursor si se indicó
+        inicio = desplazamiento
+        if cursor is not None:
+            inicio += bisect_right(categoria.tareas_ordenadas, tuple(cursor), key=Tareas.claveOrden)
+        fin = None if limite is None else inicio + limite
+        return categoria.tareas_ordenadas[inicio:fin]
 
     def deshacer(self):
         """
-        Deshace la última acción realizada (agregar, eliminar o modificar tarea).
+        Deshace la última acción realizada (tareas, categorías o tareas urgentes).
         """
         # Verificar si hay acciones para deshacer
         if not self.historial_acciones.empty():
-            # Obtener la última acción
+            # Obtener la última acción y revertirla
             ultima_accion = self.historial_acciones.get()
-            # Deshacer la acción
-            accion = ultima_accion[0]
-            # Dependiendo del tipo de acción, revertir los cambios
-            if accion == 'agregar':
-                tarea, categoria = ultima_accion[1], ultima_accion[2]
-                categoria.tareas.remove(tarea)
-            elif accion == 'eliminar':
-                tarea, categoria = ultima_accion[1], ultima_accion[2]
-                categoria.tareas.append(tarea)
-            elif accion == 'modificar':
-                tarea_anterior, tarea_modificada, categoria = ultima_accion[1], ultima_accion[2], ultima_accion[3]
-                # Revertimos los cambios
-                tarea_modificada.titulo = tarea_anterior.titulo
-                tarea_modificada.descripcion = tarea_anterior.descripcion
-                tarea_modificada.prioridad = tarea_anterior.prioridad
-                tarea_modificada.fecha_vencimiento = tarea_anterior.fecha_vencimiento
+            if self.capturarEfectos(ultima_accion.deshacer, self) is False:
+                # La acción quedó obsoleta: se descarta en lugar de pasarla al historial de rehacer
+                self.descartarAccion(ultima_accion)
+                print("Error: La última acción ya no se puede deshacer.")
+                return
             # Agregar la acción al historial de deshacer
             self.historial_deshacer.put(ultima_accion)
             print("Acción deshecha correctamente.")
@@ -352,30 +2970,83 @@ class ManejadorTareas:
         """
         # Verificar si hay acciones para rehacer
         if not self.historial_deshacer.empty():
-            # Obtener la última acción deshecha
+            # Obtener la última acción deshecha y aplicarla de nuevo
             accion_deshacer = self.historial_deshacer.get()
-            # Rehacer la acción
-            accion = accion_deshacer[0]
-            # Dependiendo del tipo de acción, aplicar los cambios nuevamente
-            if accion == 'agregar':
-                tarea, categoria = accion_deshacer[1], accion_deshacer[2]
-                categoria.tareas.append(tarea)
-            elif accion == 'eliminar':
-                tarea, categoria = accion_deshacer[1], accion_deshacer[2]
-                categoria.tareas.remove(tarea)
-            elif accion == 'modificar':
-                tarea_anterior, tarea_modificada, categoria = accion_deshacer[1], accion_deshacer[2], accion_deshacer[3]
-                # Aplicamos nuevamente los cambios
-                tarea_modificada.titulo = tarea_anterior.titulo
-                tarea_modificada.descripcion = tarea_anterior.descripcion
-                tarea_modificada.prioridad = tarea_anterior.prioridad
-                tarea_modificada.fecha_vencimiento = tarea_anterior.fecha_vencimiento
+            if self.capturarEfectos(accion_deshacer.rehacer, self) is False:
+                self.descartarAccion(accion_deshacer)
+                print("Error: La acción ya no se puede rehacer.")
+                return
             # Agregar la acción al historial de acciones
             self.historial_acciones.put(accion_deshacer)
             print("Acción rehecha correctamente.")
         else:
             print("No hay acciones para rehacer.")
 
+    def irAlHistorial(self, posicion: int):
+        """
+        Lleva el estado al punto del historial indicado, deshaciendo o rehaciendo varias acciones de una vez.
+
+        En lugar de reproducir las acciones una a una, se calcula el estado final de
+        cada tarea afectada y se aplica una sola vez.
+
+        Args:
+            posicion (int): Número de acciones aplicadas en el punto de destino
+                (0 es antes de la primera acción del historial).
+        """
+        actual = self.historial_acciones.qsize()
+        total = actual + self.historial_deshacer.qsize()
+        if posicion < 0 or posicion > total:
+            print(f'Error: La posición debe estar entre 0 y {total}.')
+            return
+        deshacer = posicion < actual
+        origen, destino = (self.historial_acciones, self.historial_deshacer) if deshacer else (self.historial_deshacer, self.historial_acciones)
+        # Sacar las acciones en el orden en que se deshacen o rehacen
+        acciones = [origen.get() for _ in range(abs(actual - posicion))]
+        self.capturarEfectos(self.aplicarHistorial, acciones, deshacer)
+        for accion in acciones:
+            destino.put(accion)
+        print(f'Historial llevado a la posición {posicion} de {total}.')
+
+    def aplicarHistorial(self, acciones: list, deshacer: bool):
+        """
+        Aplica el estado final de varias acciones del historial, sin moverlas entre historiales.
+
+        Args:
+            acciones (list[Accion]): Acciones en el orden en que se deshacen o rehacen.
+            deshacer (bool): True para deshacerlas, False para rehacerlas.
+        """
+        # Estado final de cada tarea: la última acción aplicada en este orden es la que manda
+        estados = {}
+        otras = []
+        for accion in acciones:
+            efecto = accion.efectoTarea(deshacer)
+            if efecto is None:
+                otras.append(accion)
+                continue
+            tarea, categoria, campos = efecto
+            estado = estados.setdefault(tarea.id, [tarea, None, {}])
+            estado[1] = categoria
+            estado[2].update(campos)
+        # Las acciones que no son de tareas se rehacen antes y se deshacen después que las tareas
+        if not deshacer:
+            for accion in otras:
+                accion.rehacer(self)
+        for tarea, categoria, campos in estados.values():
+            _, categoria_actual = self.indice_tareas.get(tarea.id, (None, None))
+            if categoria_actual is not None and categoria_actual is categoria:
+                if campos:
+                    self.actualizarTarea(tarea, categoria, **campos)
+                continue
+            if categoria_actual is not None:
+                self.retirarTarea(tarea)
+            for campo, valor in campos.items():
+                setattr(tarea, campo, valor)
+            if categoria is not None:
+                self.insertarTarea(tarea, categoria)
+        if deshacer:
+            for accion in otras:
+                accion.deshacer(self)
+
     def agregarTareaUrgente(self, titulo: str, descripcion: str, prioridad: int, fecha_vencimiento: datetime, categoria_nombre: str):
         """
         Agrega una tarea urgente a una categoría específica.
@@ -395,15 +3066,18 @@ class ManejadorTareas:
             tarea = Tareas(self.idTarea, titulo, descripcion, prioridad, fecha_vencimiento)
             # Agregar la tarea urgente a la cola de tareas urgentes
             categoria.tareasUrgentes.put(tarea)
+            self.marcarCola(categoria)
             # Incrementar el contador de tareas
             self.idTarea += 1
+            self.registrarAccion(AccionAgregarUrgente(tarea, categoria))
+            self.anotar('agregarTareaUrgente', titulo, descripcion, prioridad, fecha_vencimiento, categoria_nombre)
             print(f'Tarea urgente añadida: {tarea}')
         else:
-            print('Error: La categoría no existe.')
+            self.errorCategoria(categoria_nombre)
 
     def procesarTareaUrgente(self, categoria_nombre: str):
         """
-        Procesa la siguiente tarea urgente de la categoría (FIFO).
+        Procesa la siguiente tarea urgente de la categoría (por prioridad y vencimiento, o FIFO).
 
         Args:
             categoria_nombre (str): Nombre de la categoría.
@@ -416,12 +3090,122 @@ class ManejadorTareas:
             if not categoria.tareasUrgentes.empty():
                 # Obtener la siguiente tarea urgente
                 tarea = categoria.tareasUrgentes.get()
+                self.marcarCola(categoria)
+                self.registrarAccion(AccionProcesarUrgentes((tarea,), categoria))
+                self.anotar('procesarTareaUrgente', categoria_nombre)
                 # Mostrar la tarea urgente
                 print(f'Procesando tarea urgente: {tarea}')
+                # Ejecutarla si la categoría tiene una función registrada
+                funcion = self.funciones_urgentes.get(categoria.id)
+                if funcion is not None:
+                    try:
+                        funcion(tarea)
+                    except Exception as error:
+                        print(f'Error al procesar la tarea urgente: {error}')
             else:
                 print('No hay tareas urgentes en esta categoría.')
         else:
-            print('Error: La categoría no existe.')
+            self.errorCategoria(categoria_nombre)
+
+    def procesarTareasUrgentes(self, categoria_nombre: str, max_tareas: int = None, funcion=None) -> dict:
+        """
+        Procesa en lote las tareas urgentes de una categoría.
+
+        La categoría se busca una sola vez y no se imprime nada por tarea. Si la
+        función falla con una tarea, se cuenta como error y se sigue con la siguiente.
+
+        Args:
+            categoria_nombre (str): Nombre de la categoría.
+            max_tareas (int, optional): Número máximo de tareas a procesar (todas si es None).
+            funcion (Callable[[Tareas], Any], optional): Función a aplicar a cada tarea (la registrada
+                para la categoría si es None).
+
+        Returns:
+            dict: Estadísticas con 'procesadas', 'errores', 'segundos' y 'tareas_por_segundo',
+                o None si la categoría no existe.
+        """
+        # Encontrar la categoría
+        categoria = self.encontrarCategoria(nombre=categoria_nombre)
+        if not categoria:
+            return None
+        cola = categoria.tareasUrgentes
+        if funcion is None:
+            funcion = self.funciones_urgentes.get(categoria.id)
+        procesadas = errores = 0
+        tareas = []
+        inicio = time.perf_counter()
+        while (max_tareas is None or procesadas < max_tareas) and not cola.empty():
+            tarea = cola.get()
+            tareas.append(tarea)
+            procesadas += 1
+            if funcion is not None:
+                try:
+                    funcion(tarea)
+                except Exception:
+                    errores += 1
+        segundos = time.perf_counter() - inicio
+        # Todo el lote se guarda como una sola acción del historial
+        if tareas:
+            self.marcarCola(categoria)
+            self.registrarAccion(AccionProcesarUrgentes(tuple(tareas), categoria))
+            # Al reproducir el registro se sacan las mismas tareas sin volver a ejecutarlas
+            self.anotar('procesarTareasUrgentes', categoria_nombre, procesadas)
+        return {
+            'procesadas': procesadas,
+            'errores': errores,
+            'segundos': segundos,
+            'tareas_por_segundo': procesadas / segundos if segundos else 0.0,
+        }
+
+    def retirarTareaUrgente(self, idCategoria: int) -> Tareas:
+        """
+        Saca la siguiente tarea urgente de una categoría para ejecutarla fuera del manejador.
+
+        No se guarda en el historial de deshacer, porque la tarea ya se ejecutó y deshacer
+        la volvería a encolar para ejecutarla otra vez; solo se anota en el registro de
+        escritura. Una acción anterior que la agregó ya no puede volver a encolarla.
+
+        Args:
+            idCategoria (int): ID de la categoría.
+
+        Returns:
+            Tareas: La tarea sacada, o None si la cola está vacía.
+        """
+        categoria = self.indice_categorias_id[idCategoria]
+        cola = categoria.tareasUrgentes
+        if cola.empty():
+            return None
+        tarea = cola.get()
+        self.marcarCola(categoria)
+        self.anotar('retirarTareaUrgente', idCategoria)
+        return tarea
+
+    def registrarFuncionUrgente(self, categoria_nombre: str, funcion):
+        """
+        Registra la función que ejecuta las tareas urgentes de una categoría.
+
+        Args:
+            categoria_nombre (str): Nombre de la categoría.
+            funcion (Callable[[Tareas], Any]): Función que recibe cada tarea urgente.
+        """
+        # Encontrar la categoría
+        categoria = self.encontrarCategoria(nombre=categoria_nombre)
+        if categoria:
+            self.funciones_urgentes[categoria.id] = funcion
+        else:
+            self.errorCategoria(categoria_nombre)
+
+    def ejecutarTareasUrgentes(self, **opciones) -> dict:
+        """
+        Ejecuta en paralelo las tareas urgentes de todas las categorías con función registrada.
+
+        Args:
+            **opciones: Opciones de EjecutorUrgentes (max_trabajadores, usar_procesos, ...).
+
+        Returns:
+            dict: Estadísticas de la ejecución (ver EjecutorUrgentes.ejecutar).
+        """
+        return EjecutorUrgentes(self, **opciones).ejecutar()
 
     def mostrarTareasUrgentes(self, categoria_nombre: str):
         """
@@ -437,13 +3221,96 @@ class ManejadorTareas:
             # Verificar si hay tareas urgentes
             if not categoria.tareasUrgentes.empty():
                 # Mostrar las tareas urgentes
-                print(f'Tareas urgentes en {categoria_nombre}:')
-                for tarea in list(categoria.tareasUrgentes.queue):
+                print(f'Tareas urgentes en {categoria.ruta()}:')
+                for tarea in categoria.tareasUrgentes.tareasEnOrden():
                     print(f'* ID: {tarea.id} - {tarea.titulo} - {tarea.descripcion} - Prioridad: {tarea.prioridad} - Vencimiento: {tarea.fecha_vencimiento.strftime("%d/%m/%Y")}')
             else:
                 print('No hay tareas urgentes en esta categoría.')
         else:
-            print(f'Error: La categoría "{categoria_nombre}" no existe.')
+            self.errorCategoria(categoria_nombre)
+
+
+class EjecutorUrgentes:
+    """
+    Ejecuta las tareas urgentes de un manejador con un grupo de hilos o procesos.
+
+    Las colas solo se leen desde el hilo que llama a ejecutar(); los trabajadores
+    únicamente ejecutan las funciones registradas con registrarFuncionUrgente.
+
+    Args:
+        manejador (ManejadorTareas): Manejador cuyas colas urgentes se vacían.
+        max_trabajadores (int, optional): Número de hilos o procesos.
+        usar_procesos (bool, optional): Usar procesos en lugar de hilos (las funciones deben poder serializarse).
+        max_pendientes (int, optional): Máximo de tareas enviadas sin terminar; limita la memoria usada.
+        reintentos (int, optional): Veces que se reintenta una tarea que lanza una excepción.
+        limite_por_categoria (int, optional): Máximo de tareas de una misma categoría ejecutándose a la vez.
+    """
+    def __init__(self, manejador: 'ManejadorTareas', max_trabajadores: int = 4, usar_procesos: bool = False,
+                 max_pendientes: int = 64, reintentos: int = 0, limite_por_categoria: int = None):
+        self.manejador = manejador
+        self.max_trabajadores = max_trabajadores
+        self.usar_procesos = usar_procesos
+        self.max_pendientes = max_pendientes
+        self.reintentos = reintentos
+        self.limite_por_categoria = limite_por_categoria
+
+    def ejecutar(self) -> dict:
+        """
+        Vacía las colas urgentes hasta que no queden tareas ni ejecuciones pendientes.
+
+        Returns:
+            dict: Estadísticas con 'completadas', 'reintentadas', 'segundos' y 'fallidas'
+                (lista de tuplas (Tareas, Exception) que agotaron sus reintentos).
+        """
+        funciones = self.manejador.funciones_urgentes
+        categorias = [self.manejador.indice_categorias_id[id] for id in funciones if id in self.manejador.indice_categorias_id]
+        en_curso = {categoria.id: 0 for categoria in categorias}
+        limite = self.limite_por_categoria
+        # Cada ejecución pendiente guarda su tarea, su categoría y el número de intento
+        pendientes = {}
+        completadas = reintentadas = 0
+        fallidas = []
+        inicio = time.perf_counter()
+        claseEjecutor = ProcessPoolExecutor if self.usar_procesos else ThreadPoolExecutor
+        with claseEjecutor(max_workers=self.max_trabajadores) as ejecutor:
+            while True:
+                # Repartir el espacio libre entre las categorías por turnos
+                enviadas = True
+                while enviadas and len(pendientes) < self.max_pendientes:
+                    enviadas = False
+                    for categoria in categorias:
+                        if len(pendientes) >= self.max_pendientes:
+                            break
+                        if (limite is not None and en_curso[categoria.id] >= limite) or categoria.tareasUrgentes.empty():
+                            continue
+                        tarea = self.manejador.retirarTareaUrgente(categoria.id)
+                        futuro = ejecutor.submit(funciones[categoria.id], tarea)
+                        pendientes[futuro] = (tarea, categoria, 0)
+                        en_curso[categoria.id] += 1
+                        enviadas = True
+                if not pendientes:
+                    break
+                # Esperar a que termine al menos una ejecución
+                terminados, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    tarea, categoria, intento = pendientes.pop(futuro)
+                    error = futuro.exception()
+                    if error is None:
+                        completadas += 1
+                    elif intento < self.reintentos:
+                        # Reintentar ocupando el mismo lugar de la categoría
+                        reintentadas += 1
+                        pendientes[ejecutor.submit(funciones[categoria.id], tarea)] = (tarea, categoria, intento + 1)
+                        continue
+                    else:
+                        fallidas.append((tarea, error))
+                    en_curso[categoria.id] -= 1
+        return {
+            'completadas': completadas,
+            'reintentadas': reintentadas,
+            'segundos': time.perf_counter() - inicio,
+            'fallidas': fallidas,
+        }
 
 
 def limpiar_consola():
@@ -452,12 +3319,44 @@ def limpiar_consola():
     """
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def preguntar(mensaje: str, completar=None) -> str:
+    """
+    Lee una respuesta de la consola, autocompletando con Tab si readline está disponible.
+
+    Args:
+        mensaje (str): Texto que se muestra al usuario.
+        completar (Callable[[str], list[str]], optional): Función que devuelve las opciones para un prefijo.
+
+    Returns:
+        str: La respuesta introducida.
+    """
+    if readline is None or completar is None:
+        return input(mensaje)
+    opciones = []
+
+    def completador(texto, estado):
+        # readline pide las opciones una a una; se calculan al pedir la primera
+        if estado == 0:
+            opciones[:] = completar(texto)
+        return opciones[estado] if estado < len(opciones) else None
+
+    readline.set_completer(completador)
+    try:
+        return input(mensaje)
+    finally:
+        readline.set_completer(None)
+
 def consola_interactiva():
     """
     Proporciona una consola interactiva para gestionar categorías, subcategorías, y tareas.
     """
-    # Crear un manejador de tareas
-    manejador = ManejadorTareas()
+    # Crear un manejador de tareas recuperando lo guardado en el registro
+    manejador = ManejadorTareas.recuperar(RUTA_REGISTRO, RUTA_INSTANTANEA)
+    completar_categorias = manejador.autocompletarCategorias
+    # Completar la línea entera con Tab (los nombres pueden tener espacios)
+    if readline is not None:
+        readline.set_completer_delims('')
+        readline.parse_and_bind('bind ^I rl_complete' if 'libedit' in (readline.__doc__ or '') else 'tab: complete')
     
     # Bucle principal
     while True:
@@ -477,7 +3376,8 @@ def consola_interactiva():
         print("10. Procesar tarea urgente")
         print("11. Mostrar tareas urgentes")
         print("12. Mostrar todas las categorías y subcategorías")
-        print("13. Salir")
+        print("13. Buscar tareas")
+        print("14. Salir")
         
         # Leer la opción seleccionada
         opcion = input("Selecciona una opción: ")
@@ -495,7 +3395,7 @@ def consola_interactiva():
         elif opcion == '2':
             limpiar_consola()
             # Agregar una nueva subcategoría
-            nombre_categoria_padre = input("Introduce el nombre de la categoría padre: ")
+            nombre_categoria_padre = preguntar("Introduce el nombre o la ruta de la categoría padre: ", completar_categorias)
             nombre_subcategoria = input("Introduce el nombre de la nueva subcategoría: ")
             # Verificar si se ingresó un nombre válido de lo contrario mostrar un mensaje de error
             if nombre_categoria_padre and nombre_subcategoria:
@@ -506,7 +3406,7 @@ def consola_interactiva():
         elif opcion == '3':
             limpiar_consola()
             # Agregar una nueva tarea
-            nombre_categoria = input("Introduce la categoría de la tarea: ")
+            nombre_categoria = preguntar("Introduce la categoría de la tarea: ", completar_categorias)
             titulo = input("Introduce el título de la tarea: ")
             descripcion = input("Introduce la descripción de la tarea: ")
             # Solicitar la prioridad de la tarea
@@ -530,14 +3430,14 @@ def consola_interactiva():
 
         elif opcion == '4':
             limpiar_consola()
-            # Modificar una tarea existente
-            nombre_categoria = input("Introduce la categoría de la tarea: ")
+            # Modificar una tarea existente (la categoría es opcional)
+            nombre_categoria = preguntar("Introduce la categoría de la tarea (Enter para buscar solo por ID): ", completar_categorias) or None
             try:
                 id_tarea = int(input("Introduce el ID de la tarea a modificar: "))
             except ValueError:
                 print("Error: El ID debe ser un número.")
                 continue
-            nuevo_titulo = input("Introduce el nuevo título de la tarea: ")
+            nuevo_titulo = preguntar("Introduce el nuevo título de la tarea: ", manejador.autocompletarTareas)
             nueva_descripcion = input("Introduce la nueva descripción de la tarea: ")
             try:
                 nueva_prioridad = int(input("Introduce la nueva prioridad de la tarea (1 alta, 3 baja): "))
@@ -555,8 +3455,8 @@ def consola_interactiva():
 
         elif opcion == '5':
             limpiar_consola()
-            # Eliminar una tarea
-            nombre_categoria = input("Introduce la categoría de la tarea: ")
+            # Eliminar una tarea (la categoría es opcional)
+            nombre_categoria = preguntar("Introduce la categoría de la tarea (Enter para buscar solo por ID): ", completar_categorias) or None
             try:
                 # Solicitar el ID de la tarea a eliminar
                 id_tarea = int(input("Introduce el ID de la tarea a eliminar: "))
@@ -568,7 +3468,7 @@ def consola_interactiva():
         elif opcion == '6':
             limpiar_consola()
             # Mostrar tareas ordenadas por prioridad y fecha de vencimiento
-            nombre_categoria = input("Introduce la categoría para mostrar tareas ordenadas: ")
+            nombre_categoria = preguntar("Introduce la categoría para mostrar tareas ordenadas: ", completar_categorias)
             manejador.mostrarTareasOrdenadas(nombre_categoria)
 
         elif opcion == '7':
@@ -584,7 +3484,7 @@ def consola_interactiva():
         elif opcion == '9':
             limpiar_consola()
             # Agregar una tarea urgente
-            nombre_categoria = input("Introduce la categoría de la tarea urgente: ")
+            nombre_categoria = preguntar("Introduce la categoría de la tarea urgente: ", completar_categorias)
             titulo = input("Introduce el título de la tarea urgente: ")
             descripcion = input("Introduce la descripción de la tarea urgente: ")
             try:
@@ -605,13 +3505,13 @@ def consola_interactiva():
         elif opcion == '10':
             limpiar_consola()
             # Procesar la siguiente tarea urgente
-            nombre_categoria = input("Introduce la categoría para procesar tareas urgentes: ")
+            nombre_categoria = preguntar("Introduce la categoría para procesar tareas urgentes: ", completar_categorias)
             manejador.procesarTareaUrgente(nombre_categoria)
         
         elif opcion == '11':
             limpiar_consola()
             # Mostrar tareas urgentes de una categoría
-            nombre_categoria = input("Introduce la categoría para mostrar las tareas urgentes: ")
+            nombre_categoria = preguntar("Introduce la categoría para mostrar las tareas urgentes: ", completar_categorias)
             manejador.mostrarTareasUrgentes(nombre_categoria)
 
         elif opcion == '12':
@@ -621,13 +3521,23 @@ def consola_interactiva():
 
         elif opcion == '13':
             limpiar_consola()
-            # Salir del programa
+            # Buscar tareas por palabras del título o la descripción
+            consulta = preguntar('Introduce las palabras a buscar ("frase", -excluir, OR): ', manejador.autocompletarTareas)
+            manejador.mostrarBusqueda(consulta)
+
+        elif opcion == '14':
+            limpiar_consola()
+            # Salir del programa compactando el registro en una instantánea
+            manejador.guardarInstantanea()
+            manejador.registro.cerrar()
             print("Saliendo del programa...")
             break
 
         else:
             # Mostrar mensaje de error si la opción no es válida
             print("Opción no válida. Por favor, selecciona una opción válida.")
+        # Confirmar en el registro las operaciones de esta opción
+        manejador.registro.confirmar()
         # Esperar a que el usuario presione Enter para continuar
         input("\nPresiona Enter para continuar...")
 
@@ -0,0 +1,67 @@
+import contextlib
+import io
+import os
+import random
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def estadoManejador(manejador) -> tuple:
+    """Categorías, tareas, colas urgentes y contadores de un manejador, comparables con ==."""
+    def tarea(t):
+        return t.id, t.titulo, t.descripcion, t.prioridad, t.fecha_vencimiento
+
+    def categoria(c):
+        return (c.id, c.nombre, [tarea(t) for t in c.tareas], [tarea(t) for t in c.tareasUrgentes.tareasEnOrden()],
+                [categoria(s) for s in c.subcategorias])
+
+    return [categoria(c) for c in manejador.categorias], manejador.idTarea, manejador.idCategoria
+
+
+def operacionesAleatorias(manejador, cantidad: int, semilla: int):
+    """Aplica una mezcla reproducible de operaciones, incluidas deshacer, rehacer e irAlHistorial."""
+    aleatorio = random.Random(semilla)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for numero in range(cantidad):
+            valor = aleatorio.random()
+            nombres = [c.ruta() for c in manejador.indice_categorias_id.values()] or ['ninguna']
+            nombre = aleatorio.choice(nombres)
+            fecha = datetime(2024, 1, aleatorio.randint(1, 5))
+            if valor < .06:
+                manejador.agregarCategoria(f'C{numero}')
+            elif valor < .12:
+                manejador.agregarSubcategoria(f'S{numero}', nombre)
+            elif valor < .42:
+                manejador.agregarTarea(f'tarea {numero} é', 'descripción', aleatorio.randint(1, 3), fecha, nombre)
+            elif valor < .52:
+                manejador.agregarTareaUrgente(f'urgente {numero}', 'd', aleatorio.randint(1, 3), fecha, nombre)
+            elif valor < .57:
+                manejador.procesarTareaUrgente(nombre)
+            elif valor < .6:
+                manejador.procesarTareasUrgentes(nombre, 2)
+            elif valor < .64:
+                manejador.eliminarTarea(aleatorio.randint(1, max(manejador.idTarea, 1)))
+            elif valor < .74:
+                manejador.modificarTarea(aleatorio.randint(1, max(manejador.idTarea, 1)), 'x', 'y',
+                                         aleatorio.randint(1, 3), fecha)
+            elif valor < .84:
+                manejador.deshacer()
+            elif valor < .92:
+                manejador.rehacer()
+            else:
+                actual = manejador.historial_acciones.qsize()
+                manejador.irAlHistorial(aleatorio.randint(max(actual - 5, 0), actual + manejador.historial_deshacer.qsize()))
+
+
+@pytest.fixture
+def estado():
+    return estadoManejador
+
+
+@pytest.fixture
+def operaciones():
+    return operacionesAleatorias
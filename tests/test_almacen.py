@@ -0,0 +1,117 @@
+import contextlib
+import io
+from datetime import datetime
+
+import pytest
+
+from main import ManejadorTareas
+
+
+def reabrir(manejador, ruta: str, **opciones) -> ManejadorTareas:
+    """Guarda los cambios pendientes de un manejador y abre de nuevo su base de datos."""
+    manejador.guardarAlmacen()
+    manejador.almacen.conexion.close()
+    return ManejadorTareas.abrirAlmacen(ruta, **opciones)
+
+
+@pytest.mark.parametrize('completo', [False, True])
+def test_guardar_y_abrir_conserva_el_estado(tmp_path, estado, operaciones, completo):
+    ruta = str(tmp_path / 'tareas.db')
+    manejador = ManejadorTareas.abrirAlmacen(ruta)
+    operaciones(manejador, 400, 11)
+    manejador.guardarAlmacen(completo=completo)
+    abierto = ManejadorTareas.abrirAlmacen(ruta)
+    assert estado(abierto) == estado(manejador)
+    # Los cambios hechos sobre una base ya guardada se escriben de forma incremental
+    operaciones(manejador, 300, 12)
+    assert estado(reabrir(manejador, ruta)) == estado(manejador)
+
+
+@pytest.mark.parametrize('max_hidratadas', [None, 2])
+def test_carga_perezosa_conserva_el_estado(tmp_path, estado, operaciones, max_hidratadas):
+    ruta = str(tmp_path / 'tareas.db')
+    manejador = ManejadorTareas.abrirAlmacen(ruta)
+    operaciones(manejador, 400, 13)
+    perezoso = reabrir(manejador, ruta, perezoso=True, max_hidratadas=max_hidratadas)
+    assert estado(ManejadorTareas.abrirAlmacen(ruta, perezoso=True, max_hidratadas=max_hidratadas)) == estado(manejador)
+    # Las operaciones cargan bajo demanda las categorías que usan
+    assert not any(categoria.cargado('tareas') for categoria in perezoso.categorias)
+    operaciones(perezoso, 300, 14)
+    esperado = estado(perezoso)
+    assert estado(reabrir(perezoso, ruta)) == esperado
+    assert estado(ManejadorTareas.abrirAlmacen(ruta, perezoso=True, max_hidratadas=max_hidratadas)) == esperado
+
+
+def test_almacen_conserva_fracciones_de_segundo(tmp_path):
+    ruta = str(tmp_path / 'tareas.db')
+    manejador = ManejadorTareas.abrirAlmacen(ruta)
+    fecha = datetime(1969, 12, 31, 23, 59, 59, 500000)
+    with contextlib.redirect_stdout(io.StringIO()):
+        manejador.agregarCategoria('A')
+        manejador.agregarTarea('normal', 'd', 1, fecha, 'A')
+    abierto = reabrir(manejador, ruta)
+    assert [tarea.fecha_vencimiento for tarea in abierto.encontrarCategoria(nombre='A').tareas] == [fecha]
+
+
+def test_carga_perezosa_descarga_categorias_guardadas_sin_historial(tmp_path, estado):
+    ruta = str(tmp_path / 'tareas.db')
+    manejador = ManejadorTareas.abrirAlmacen(ruta)
+    nombres = ['A', 'B', 'C', 'D', 'E']
+    with contextlib.redirect_stdout(io.StringIO()):
+        for nombre in nombres:
+            manejador.agregarCategoria(nombre)
+            manejador.agregarTarea(f'tarea {nombre}', 'd', 1, datetime(2024, 1, 1), nombre)
+    perezoso = reabrir(manejador, ruta, perezoso=True, max_hidratadas=1, max_historial=2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for nombre in nombres[:4]:
+            perezoso.agregarTarea('nueva', 'd', 1, datetime(2024, 1, 2), nombre)
+    # Sin guardar, las cuatro categorías tienen cambios y ninguna se descarga
+    assert set(perezoso.hidratadas) == {1, 2, 3, 4}
+    perezoso.guardarAlmacen()
+    # Solo las dos últimas acciones siguen en el historial y fijan su categoría
+    assert set(perezoso.referencias_historial) == {3, 4}
+    perezoso.encontrarCategoria(nombre='E').tareas
+    assert set(perezoso.hidratadas) == {3, 4, 5}
+    # Deshacer mantiene la acción (ahora para rehacer), y una acción nueva la descarta
+    with contextlib.redirect_stdout(io.StringIO()):
+        perezoso.deshacer()
+        perezoso.agregarTarea('otra', 'd', 1, datetime(2024, 1, 2), 'E')
+    assert set(perezoso.referencias_historial) == {3, 5}
+    perezoso.guardarAlmacen()
+    perezoso.encontrarCategoria(nombre='A').tareas
+    assert set(perezoso.hidratadas) == {3, 5, 1}
+    assert estado(perezoso) == estado(ManejadorTareas.abrirAlmacen(ruta))
+
+
+def busquedas(manejador, consultas: list[str]) -> list:
+    """Resultados de buscarTareas y autocompletarTareas de un manejador, comparables con ==."""
+    resultados = [[(tarea.id, categoria.id, round(puntuacion, 9)) for tarea, categoria, puntuacion
+                   in manejador.buscarTareas(consulta)] for consulta in consultas]
+    return resultados, [manejador.autocompletarTareas(prefijo) for prefijo in ('co', 'Pa', 'x', '')]
+
+
+def test_carga_perezosa_busca_en_las_categorias_sin_cargar(tmp_path):
+    ruta = str(tmp_path / 'tareas.db')
+    manejador = ManejadorTareas.abrirAlmacen(ruta)
+    textos = [('Comprar pan', 'pan integral'), ('Compra semanal', 'leche y pan'), ('Pagar luz', 'recibo de la luz'),
+              ('Correo', 'responder a Ana sobre el pan'), ('pan', 'comprar'), ('Pasear', 'parque con Ana')]
+    with contextlib.redirect_stdout(io.StringIO()):
+        for nombre in ('A', 'B', 'C'):
+            manejador.agregarCategoria(nombre)
+        manejador.agregarSubcategoria('D', 'C')
+        for numero, (titulo, descripcion) in enumerate(textos * 2):
+            manejador.agregarTarea(titulo, descripcion, 1, datetime(2024, 1, 1), 'ABCD'[numero % 4])
+        manejador.agregarTareaUrgente('Comprar urgente', 'pan', 1, datetime(2024, 1, 1), 'A')
+    consultas = ['pan', 'comprar pan', '"comprar pan"', 'pan -leche', 'luz OR ana', 'NOT pan', 'recibo "de la"']
+    perezoso = reabrir(manejador, ruta, perezoso=True)
+    assert busquedas(perezoso, consultas) == busquedas(manejador, consultas)
+    # Los cambios sin guardar de las categorías cargadas cuentan, y no lo guardado antes de ellos
+    with contextlib.redirect_stdout(io.StringIO()):
+        for abierto in (manejador, perezoso):
+            abierto.modificarTarea(1, 'Pasta', 'sin pan', 2, datetime(2024, 1, 2))
+            abierto.eliminarTarea(2)
+            abierto.agregarTarea('Correo urgente', 'pan', 1, datetime(2024, 1, 1), 'B')
+    assert busquedas(perezoso, consultas) == busquedas(manejador, consultas)
+    # Guardar de forma incremental mantiene al día el índice de palabras del almacén
+    perezoso = reabrir(perezoso, ruta, perezoso=True)
+    assert busquedas(perezoso, consultas) == busquedas(manejador, consultas)
@@ -0,0 +1,105 @@
+import contextlib
+import io
+from collections import Counter
+from concurrent.futures import wait
+from datetime import datetime
+
+import pytest
+
+import main
+from main import ManejadorTareas
+
+
+def manejadorConUrgentes(cantidad: int, **opciones) -> ManejadorTareas:
+    """Crea un manejador con una categoría 'A' que tiene varias tareas urgentes."""
+    manejador = ManejadorTareas(**opciones)
+    with contextlib.redirect_stdout(io.StringIO()):
+        manejador.agregarCategoria('A')
+        for numero in range(cantidad):
+            manejador.agregarTareaUrgente(f'urgente {numero}', 'd', 1, datetime(2024, 1, 1), 'A')
+    return manejador
+
+
+def test_ejecutar_no_agrega_acciones_al_historial():
+    manejador = manejadorConUrgentes(20, max_historial=25)
+    manejador.agregarTarea('editada', 'd', 1, datetime(2024, 1, 1), 'A')
+    ejecutadas = []
+    manejador.registrarFuncionUrgente('A', ejecutadas.append)
+    antes = manejador.historial_acciones.qsize()
+    manejador.ejecutarTareasUrgentes(max_trabajadores=2)
+    assert len(ejecutadas) == 20
+    assert manejador.historial_acciones.qsize() == antes
+    # Deshacer afecta a la última acción del usuario y no devuelve tareas ya ejecutadas a la cola
+    with contextlib.redirect_stdout(io.StringIO()):
+        manejador.deshacer()
+    categoria = manejador.encontrarCategoria(nombre='A')
+    assert categoria.tareas == []
+    assert categoria.tareasUrgentes.empty()
+    # Tampoco deshacer las tareas urgentes agregadas, que ya no están en la cola
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(20):
+            manejador.deshacer()
+    assert categoria.tareasUrgentes.empty()
+    manejador.ejecutarTareasUrgentes(max_trabajadores=2)
+    assert len(ejecutadas) == 20
+
+
+@pytest.fixture
+def esperas(monkeypatch) -> list[Counter]:
+    """Cada vez que el ejecutor espera, anota cuántas ejecuciones tiene pendientes de cada categoría."""
+    esperas = []
+
+    def esperar(pendientes, **opciones):
+        esperas.append(Counter(categoria.nombre for _, categoria, _ in pendientes.values()))
+        return wait(pendientes, **opciones)
+
+    monkeypatch.setattr(main, 'wait', esperar)
+    return esperas
+
+
+def test_ejecutar_reintenta_las_tareas_que_fallan():
+    manejador = manejadorConUrgentes(3)
+    intentos = {}
+    errores = {}
+
+    def ejecutar(tarea):
+        intentos[tarea.titulo] = intentos.get(tarea.titulo, 0) + 1
+        # 'urgente 0' funciona, 'urgente 1' falla dos veces y 'urgente 2' siempre falla
+        if intentos[tarea.titulo] <= {'urgente 0': 0, 'urgente 1': 2, 'urgente 2': 9}[tarea.titulo]:
+            errores[tarea.titulo] = ValueError(tarea.titulo)
+            raise errores[tarea.titulo]
+
+    manejador.registrarFuncionUrgente('A', ejecutar)
+    resultado = manejador.ejecutarTareasUrgentes(max_trabajadores=2, reintentos=2)
+    assert intentos == {'urgente 0': 1, 'urgente 1': 3, 'urgente 2': 3}
+    assert resultado['completadas'] == 2
+    assert resultado['reintentadas'] == 4
+    assert [(tarea.titulo, error) for tarea, error in resultado['fallidas']] == [('urgente 2', errores['urgente 2'])]
+    assert manejador.encontrarCategoria(nombre='A').tareasUrgentes.empty()
+
+
+def test_ejecutar_no_supera_max_pendientes(esperas):
+    manejador = manejadorConUrgentes(9)
+    ejecutadas = []
+    manejador.registrarFuncionUrgente('A', ejecutadas.append)
+    resultado = manejador.ejecutarTareasUrgentes(max_trabajadores=8, max_pendientes=3)
+    assert resultado['completadas'] == len(ejecutadas) == 9
+    # Antes de esperar se envían tareas hasta llenar el cupo, nunca más
+    assert esperas[0] == {'A': 3}
+    assert max(sum(espera.values()) for espera in esperas) == 3
+
+
+def test_ejecutar_limita_las_tareas_de_cada_categoria(esperas):
+    manejador = manejadorConUrgentes(4)
+    with contextlib.redirect_stdout(io.StringIO()):
+        manejador.agregarCategoria('B')
+        for numero in range(4):
+            manejador.agregarTareaUrgente(f'urgente B{numero}', 'd', 1, datetime(2024, 1, 1), 'B')
+    ejecutadas = []
+    for nombre in ('A', 'B'):
+        manejador.registrarFuncionUrgente(nombre, ejecutadas.append)
+    resultado = manejador.ejecutarTareasUrgentes(max_trabajadores=4, limite_por_categoria=1)
+    assert resultado['completadas'] == len(ejecutadas) == 8
+    # Con hueco para más, cada categoría tiene como mucho una ejecución pendiente
+    assert esperas[0] == {'A': 1, 'B': 1}
+    assert all(max(espera.values()) == 1 for espera in esperas)
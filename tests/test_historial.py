@@ -0,0 +1,64 @@
+import contextlib
+import io
+from datetime import datetime
+
+import pytest
+
+from main import ManejadorTareas
+
+
+def manejadorConHistorial() -> ManejadorTareas:
+    """Crea un manejador con un historial que mezcla categorías, tareas editadas varias veces y urgentes."""
+    manejador = ManejadorTareas()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manejador.agregarCategoria('A')
+        manejador.agregarSubcategoria('B', 'A')
+        manejador.agregarTarea('uno', 'd', 1, datetime(2024, 1, 1), 'A')
+        manejador.agregarTarea('dos', 'd', 2, datetime(2024, 1, 2), 'B')
+        manejador.modificarTarea(1, 'uno bis', 'e', 3, datetime(2024, 1, 3))
+        manejador.agregarTareaUrgente('urgente', 'd', 1, datetime(2024, 1, 1), 'A')
+        manejador.modificarTarea(1, 'uno ter', 'f', 2, datetime(2024, 1, 4))
+        manejador.eliminarTarea(2)
+        manejador.procesarTareaUrgente('A')
+        manejador.agregarTarea('tres', 'd', 1, datetime(2024, 1, 5), 'B')
+        manejador.eliminarTarea(1)
+    return manejador
+
+
+def estadoHistorial(manejador, estado) -> tuple:
+    """Estado del manejador junto con el tamaño de sus dos historiales."""
+    return estado(manejador), manejador.historial_acciones.qsize(), manejador.historial_deshacer.qsize()
+
+
+@pytest.mark.parametrize('origen', [0, 4, 11])
+def test_ir_al_historial_equivale_a_deshacer_y_rehacer(estado, origen):
+    total = manejadorConHistorial().historial_acciones.qsize()
+    assert total == 11
+    for destino in range(total + 1):
+        saltando, paso_a_paso = manejadorConHistorial(), manejadorConHistorial()
+        with contextlib.redirect_stdout(io.StringIO()):
+            saltando.irAlHistorial(origen)
+            saltando.irAlHistorial(destino)
+            for _ in range(total - origen):
+                paso_a_paso.deshacer()
+            for _ in range(destino - origen):
+                paso_a_paso.rehacer()
+            for _ in range(origen - destino):
+                paso_a_paso.deshacer()
+        assert estadoHistorial(saltando, estado) == estadoHistorial(paso_a_paso, estado)
+
+
+def test_accion_nueva_vacia_la_pila_de_rehacer(estado):
+    manejador = manejadorConHistorial()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manejador.deshacer()
+        manejador.deshacer()
+        assert manejador.historial_deshacer.qsize() == 2
+        manejador.agregarTarea('cuatro', 'd', 1, datetime(2024, 1, 6), 'A')
+    assert manejador.historial_deshacer.empty()
+    antes = estadoHistorial(manejador, estado)
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        manejador.rehacer()
+    assert salida.getvalue() == 'No hay acciones para rehacer.\n'
+    assert estadoHistorial(manejador, estado) == antes
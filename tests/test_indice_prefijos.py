@@ -0,0 +1,78 @@
+import pytest
+
+from main import IndicePrefijos
+
+PALABRAS = ['casa', 'Casa', 'CASA', 'cosa', 'cama', 'árbol', 'Árbol', 'zeta']
+
+
+def pares(cantidad: int) -> list[tuple[str, int]]:
+    """Pares (texto, id) con textos repetidos y mayúsculas mezcladas, en un orden desordenado."""
+    return [(PALABRAS[id * 5 % len(PALABRAS)] + (f' {id % 3}' if id % 2 else ''), id)
+            for id in (numero * 37 % cantidad for numero in range(cantidad))]
+
+
+def comprobarBloques(indice: IndicePrefijos, pares: list[tuple[str, int]]):
+    """Comprueba que los bloques contienen exactamente los pares, en orden y con su tamaño y máximo."""
+    assert list(indice) == sorted((IndicePrefijos.clave(texto), texto, id) for texto, id in pares)
+    assert len(indice) == len(pares)
+    assert all(0 < len(bloque) <= 2 * indice.TAMANO_BLOQUE for bloque in indice.bloques)
+    assert indice.maximos == [bloque[-1] for bloque in indice.bloques]
+
+
+def completados(pares: list[tuple[str, int]], prefijo: str, limite: int) -> list[str]:
+    """Resultado esperado de completar, recorriendo todos los textos."""
+    textos = sorted({(IndicePrefijos.clave(texto), texto) for texto, _ in pares})
+    return [texto for clave, texto in textos if clave.startswith(IndicePrefijos.clave(prefijo))][:limite]
+
+
+@pytest.fixture
+def bloques_pequenos(monkeypatch):
+    monkeypatch.setattr(IndicePrefijos, 'TAMANO_BLOQUE', 2)
+
+
+def test_agregar_y_quitar_parten_y_vacian_bloques(bloques_pequenos):
+    indice = IndicePrefijos()
+    agregados = []
+    for texto, id in pares(60):
+        indice.agregar(texto, id)
+        agregados.append((texto, id))
+        comprobarBloques(indice, agregados)
+    assert len(indice.bloques) > 10
+    for prefijo in ['ca', 'CAS', 'casa 1', 'Ár', 'arbol', 'z', '', 'x']:
+        for limite in [1, 3, 10]:
+            assert indice.completar(prefijo, limite) == completados(agregados, prefijo, limite)
+    # Quitar un texto que no está no cambia nada
+    indice.quitar('casa', 1000)
+    comprobarBloques(indice, agregados)
+    while agregados:
+        texto, id = agregados.pop(len(agregados) // 3)
+        indice.quitar(texto, id)
+        comprobarBloques(indice, agregados)
+        assert indice.completar('c', 4) == completados(agregados, 'c', 4)
+    assert indice.bloques == [] and indice.maximos == []
+
+
+def test_agregar_varios_reparte_en_bloques(bloques_pequenos):
+    indice = IndicePrefijos()
+    primeros, resto = pares(40)[:7], pares(40)[7:]
+    for texto, id in primeros:
+        indice.agregar(texto, id)
+    indice.agregarVarios(resto)
+    comprobarBloques(indice, primeros + resto)
+    assert [len(bloque) for bloque in indice.bloques] == [2] * 20
+    indice.agregar('casa', 99)
+    comprobarBloques(indice, primeros + resto + [('casa', 99)])
+    assert indice.completar('CA', 3) == completados(primeros + resto, 'ca', 3)
+
+
+def test_completar_con_el_tamano_de_bloque_normal():
+    indice = IndicePrefijos()
+    todos = pares(3000)
+    indice.agregarVarios(todos[:1000])
+    for texto, id in todos[1000:]:
+        indice.agregar(texto, id)
+    comprobarBloques(indice, todos)
+    assert len(indice.bloques) > 2
+    # Los textos repetidos ocupan varios bloques y se saltan de una vez
+    for prefijo in ['c', 'casa', 'ÁRBOL 2', 'zeta', '']:
+        assert indice.completar(prefijo, 20) == completados(todos, prefijo, 20)
@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from main import IndiceTexto
+
+
+@pytest.fixture
+def indice():
+    indice = IndiceTexto()
+    for id, titulo, descripcion in [(1, 'Comprar pan', 'en la panadería'),
+                                    (2, 'Lista', 'comprar pan y leche'),
+                                    (3, 'Comprar', 'pan integral'),
+                                    (4, 'Reunión', 'con Ana'),
+                                    (5, 'pan pan', 'pan')]:
+        indice.agregar(id, titulo, descripcion)
+    return indice
+
+
+def ids(indice, consulta: str) -> set[int]:
+    return {id for id, _ in indice.buscar(consulta)}
+
+
+def comprobarResultados(resultados: list[tuple[int, float]], esperados: list[tuple[int, float]]):
+    """Compara resultados de IndiceTexto.buscar: los IDs en el mismo orden y las puntuaciones aproximadas."""
+    assert [id for id, _ in resultados] == [id for id, _ in esperados]
+    assert [puntuacion for _, puntuacion in resultados] == pytest.approx([puntuacion for _, puntuacion in esperados])
+
+
+def test_buscar_ignora_mayusculas_y_tildes(indice):
+    assert ids(indice, 'reunion') == ids(indice, 'REUNIÓN') == {4}
+
+
+def test_buscar_exige_todas_las_palabras(indice):
+    assert ids(indice, 'comprar pan') == ids(indice, 'comprar AND pan') == {1, 2, 3}
+
+
+def test_frase_no_une_el_titulo_y_la_descripcion(indice):
+    # En la tarea 3 'comprar' termina el título y 'pan' empieza la descripción
+    assert ids(indice, '"comprar pan"') == {1, 2}
+    assert ids(indice, '"pan integral"') == {3}
+
+
+def test_buscar_excluye_palabras_y_frases(indice):
+    assert ids(indice, 'pan -leche') == ids(indice, 'pan NOT leche') == {1, 3, 5}
+    assert ids(indice, 'pan -"pan integral"') == {1, 2, 5}
+    # Una consulta solo de exclusiones no encuentra nada
+    assert ids(indice, '-pan') == ids(indice, 'NOT pan') == set()
+
+
+def test_or_une_los_resultados(indice):
+    assert ids(indice, 'ana OR leche') == {2, 4}
+    assert ids(indice, 'reunion OR "comprar pan" -leche') == {1, 4}
+
+
+def test_ordena_por_tf_idf_con_el_titulo_doble(indice):
+    idf = math.log(1 + 5 / 4)
+    # La tarea 5 tiene 'pan' dos veces en el título y una en la descripción: frecuencia 2 * 2 + 1
+    comprobarResultados(indice.buscar('pan'), [(5, (1 + math.log(5)) * idf), (1, (1 + math.log(2)) * idf),
+                                               (2, idf), (3, idf)])
+    # A igual puntuación gana la tarea más antigua, también al cortar por el límite
+    assert [id for id, _ in indice.buscar('pan', limite=3)] == [5, 1, 2]
+
+
+def test_quitar_actualiza_las_puntuaciones(indice):
+    indice.quitar(5)
+    # Quitar una tarea que ya no está no hace nada
+    indice.quitar(5)
+    assert 5 not in indice.palabras
+    # El idf usa las tareas del índice, o el total indicado (como en la búsqueda con carga perezosa)
+    for total, idf in [(None, math.log(1 + 4 / 3)), (8, math.log(1 + 8 / 3))]:
+        comprobarResultados(indice.buscar('pan', total=total), [(1, (1 + math.log(2)) * idf), (2, idf), (3, idf)])
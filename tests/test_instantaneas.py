@@ -0,0 +1,94 @@
+import contextlib
+import io
+from datetime import datetime
+
+import pytest
+
+from main import InstantaneaBinaria, ManejadorTareas
+
+
+def cargar(ruta: str, binaria: bool) -> ManejadorTareas:
+    """Crea un manejador vacío y carga en él una instantánea."""
+    manejador = ManejadorTareas()
+    manejador.instantanea_binaria = binaria
+    manejador.cargarInstantanea(ruta)
+    return manejador
+
+
+@pytest.fixture
+def original(operaciones):
+    manejador = ManejadorTareas()
+    operaciones(manejador, 500, 7)
+    return manejador
+
+
+@pytest.mark.parametrize('binaria', [False, True])
+def test_instantanea_conserva_el_estado(tmp_path, estado, original, binaria):
+    ruta = str(tmp_path / 'estado.instantanea')
+    original.instantanea_binaria = binaria
+    original.guardarInstantanea(ruta)
+    cargado = cargar(ruta, binaria)
+    assert estado(cargado) == estado(original)
+    # Los índices del manejador cargado también coinciden
+    assert set(cargado.indice_tareas) == set(original.indice_tareas)
+    assert list(cargado.prefijos_tareas) == list(original.prefijos_tareas)
+    assert list(cargado.prefijos_categorias) == list(original.prefijos_categorias)
+
+
+def test_instantaneas_json_y_binaria_cargan_lo_mismo(tmp_path, estado, original):
+    ruta_json, ruta_binaria = str(tmp_path / 'estado.json'), str(tmp_path / 'estado.bin')
+    original.guardarInstantanea(ruta_json)
+    original.instantanea_binaria = True
+    original.guardarInstantanea(ruta_binaria)
+    assert estado(cargar(ruta_json, False)) == estado(cargar(ruta_binaria, True))
+
+
+def test_instantanea_binaria_rechaza_otro_formato(tmp_path, original):
+    ruta = str(tmp_path / 'estado.json')
+    original.guardarInstantanea(ruta)
+    with pytest.raises(ValueError):
+        InstantaneaBinaria(ruta)
+
+
+@pytest.mark.parametrize('binaria', [False, True])
+def test_instantanea_conserva_fracciones_de_segundo(tmp_path, binaria):
+    manejador = ManejadorTareas()
+    fechas = [datetime(1969, 12, 31, 23, 59, 59, 500000), datetime(2024, 5, 1, 8, 30, 0, 123456)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        manejador.agregarCategoria('A')
+        manejador.agregarTarea('normal', 'd', 1, fechas[0], 'A')
+        manejador.agregarTareaUrgente('urgente', 'd', 1, fechas[1], 'A')
+    ruta = str(tmp_path / 'estado.instantanea')
+    manejador.instantanea_binaria = binaria
+    manejador.guardarInstantanea(ruta)
+    categoria = cargar(ruta, binaria).encontrarCategoria(nombre='A')
+    assert [tarea.fecha_vencimiento for tarea in categoria.tareas] == fechas[:1]
+    assert [tarea.fecha_vencimiento for tarea in categoria.tareasUrgentes.tareasEnOrden()] == fechas[1:]
+
+
+def test_instantanea_binaria_carga_las_tareas_al_usar_cada_categoria(tmp_path, estado, original):
+    ruta = str(tmp_path / 'estado.bin')
+    original.instantanea_binaria = True
+    original.guardarInstantanea(ruta)
+    cargado = cargar(ruta, True)
+    assert cargado.instantanea is not None
+    assert not cargado.indice_tareas
+    assert not any(categoria.cargado('tareas') for categoria in cargado.indice_categorias_id.values())
+    # Buscar una tarea por ID carga solo su categoría
+    tarea, categoria = original.encontrarTarea(max(original.indice_tareas))
+    encontrada, guardada = cargado.encontrarTarea(tarea.id)
+    assert (encontrada.id, guardada.id) == (tarea.id, categoria.id)
+    assert [c.id for c in cargado.indice_categorias_id.values() if c.cargado('tareas')] == [categoria.id]
+    # Al cargar todas las categorías se cierra el archivo
+    assert estado(cargado) == estado(original)
+    assert cargado.instantanea is None
+
+
+def test_instantanea_binaria_se_reescribe_mientras_esta_abierta(tmp_path, estado, original):
+    ruta = str(tmp_path / 'estado.bin')
+    original.instantanea_binaria = True
+    original.guardarInstantanea(ruta)
+    cargado = cargar(ruta, True)
+    cargado.guardarInstantanea(ruta)
+    assert cargado.instantanea is None
+    assert estado(cargar(ruta, True)) == estado(original)
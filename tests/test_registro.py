@@ -0,0 +1,64 @@
+import contextlib
+import io
+
+import pytest
+
+from main import ManejadorTareas
+
+
+def recuperarCerrando(manejador, ruta, **opciones):
+    """Cierra el registro de un manejador y recupera otro desde el mismo archivo."""
+    manejador.registro.cerrar()
+    return ManejadorTareas.recuperar(ruta, **opciones)
+
+
+@pytest.mark.parametrize('sincronizar', ['siempre', 'grupo', 'nunca'])
+def test_reproducir_registro_da_el_estado_en_vivo(tmp_path, estado, operaciones, sincronizar):
+    ruta = str(tmp_path / 'registro.wal')
+    manejador = ManejadorTareas.recuperar(ruta, sincronizar=sincronizar, tamano_grupo=8)
+    operaciones(manejador, 400, 1)
+    recuperado = recuperarCerrando(manejador, ruta)
+    assert estado(recuperado) == estado(manejador)
+    # El manejador recuperado sigue anotando en el mismo registro
+    operaciones(recuperado, 200, 2)
+    assert estado(recuperarCerrando(recuperado, ruta)) == estado(recuperado)
+
+
+def test_escritura_cortada_se_descarta(tmp_path, estado, operaciones):
+    ruta = str(tmp_path / 'registro.wal')
+    manejador = ManejadorTareas.recuperar(ruta)
+    operaciones(manejador, 300, 3)
+    manejador.registro.cerrar()
+    with open(ruta, 'a', encoding='utf-8') as archivo:
+        archivo.write('[99999, "agregarCat')
+    recuperado = ManejadorTareas.recuperar(ruta)
+    assert estado(recuperado) == estado(manejador)
+    operaciones(recuperado, 100, 4)
+    assert estado(recuperarCerrando(recuperado, ruta)) == estado(recuperado)
+
+
+@pytest.mark.parametrize('binaria', [False, True])
+def test_instantaneas_conservan_el_historial(tmp_path, estado, operaciones, binaria):
+    ruta = str(tmp_path / 'registro.wal')
+    opciones = dict(ruta_instantanea=str(tmp_path / 'estado.instantanea'), instantanea_binaria=binaria)
+    manejador = ManejadorTareas.recuperar(ruta, instantanea_cada=3, **opciones)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for nombre in ('A', 'B', 'C', 'D'):
+            manejador.agregarCategoria(nombre)
+        manejador.deshacer()
+        manejador.deshacer()
+    assert [c.nombre for c in manejador.categorias] == ['A', 'B']
+    assert manejador.historial_deshacer.qsize() == 2
+    assert (tmp_path / 'estado.instantanea').exists()
+    operaciones(manejador, 300, 5)
+    recuperado = recuperarCerrando(manejador, ruta, **opciones)
+    assert estado(recuperado) == estado(manejador)
+    # El historial de deshacer no se guarda
+    assert recuperado.historial_acciones.qsize() == 0
+
+
+def test_instantanea_sin_archivo_muestra_error():
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        ManejadorTareas().guardarInstantanea()
+    assert salida.getvalue().startswith('Error:')